@@ -0,0 +1,121 @@
+"""Autosave of the editor state, so a session survives a closed tab or a server restart.
+
+Every change recorded by the session's RevisionStore is queued to a SQLite
+log (see ``hocon_core.session_store``) under the session id kept in the
+``?session=`` query parameter. Opening that URL in a new session replays
+the log straight into records, without going through HOCON.
+
+Autosave is off unless ``HOCON_EDITOR_AUTOSAVE`` is set to the database
+path. Anyone with a session id can restore that session, and saved
+sessions are kept until the database is deleted, so only turn it on where
+the editor's users trust each other.
+"""
+import os
+import uuid
+
+import streamlit as st
+
+from hocon_core import Agent, Function, LRUCache, SessionStore, Var, build_sub_dict, new_network_state
+from substitution_tab import RECENT_UPLOADS
+
+AUTOSAVE_PATH = os.environ.get("HOCON_EDITOR_AUTOSAVE", "")
+
+
+@st.cache_resource
+def get_session_store():
+    # One writer thread and one database for the whole process
+    return SessionStore(AUTOSAVE_PATH) if AUTOSAVE_PATH else None
+
+
+def agent_payload(key):
+    agent = st.session_state.inputs.get(key)
+    if agent is None:
+        return None
+    return {"agent": agent.to_dict(), "function_name": st.session_state.function_names.get(key, "")}
+
+
+def record_payload(collection):
+    def payload(key):
+        record = st.session_state[collection].get(key)
+        return None if record is None else record.to_dict()
+    return payload
+
+
+PAYLOADS = {
+    "agents": ("inputs", agent_payload),
+    "functions": ("functions", record_payload("functions")),
+    "vars": ("user_vars", record_payload("user_vars")),
+}
+
+
+def record_change(kind, keys):
+    """RevisionStore hook: queue the changed entities, or the whole kind, for the writer thread."""
+    store = get_session_store()
+    session = st.session_state.get("autosave_session")
+    if store is None or session is None:
+        return
+
+    if kind == "network":
+        store.record(session, kind, payload={"llm_model": st.session_state.llm_model,
+                                             "temperature": st.session_state.temperature})
+        return
+
+    collection, payload = PAYLOADS[kind]
+    if keys:
+        for key in keys:
+            store.record(session, kind, key, payload(key))
+    else:
+        store.record(session, kind, payload={str(key): payload(key) for key in st.session_state[collection]})
+
+
+def by_key(entities, record_class):
+    return {key: record_class.from_dict(entities[str(key)]) for key in sorted(map(int, entities))}
+
+
+def restore(state):
+    """Put a folded autosave log back into session state."""
+    if "network" in state and "agents" in state:
+        st.session_state.update(new_network_state())
+        st.session_state.show_sidebar = True
+        st.session_state.errors = {}
+        st.session_state.hierarchical = False
+        st.session_state.agent_page = 0
+        st.session_state.network_file_name = "network.hocon"
+        st.session_state.llm_model = state["network"]["llm_model"]
+        st.session_state.temperature = state["network"]["temperature"]
+        agents = {int(key): value for key, value in state["agents"].items()}
+        st.session_state.inputs = {key: Agent.from_dict(value["agent"]) for key, value in sorted(agents.items())}
+        st.session_state.function_names = {key: value["function_name"] for key, value in agents.items()}
+
+    if "functions" in state:
+        st.session_state.functions = by_key(state["functions"], Function)
+        st.session_state.function_errors = {key: "" for key in st.session_state.functions}
+        st.session_state.function_results = {}
+        st.session_state.function_file_name = "function.hocon"
+
+    if "vars" in state:
+        st.session_state.user_vars = by_key(state["vars"], Var)
+        st.session_state.existing_files = LRUCache(maxsize=RECENT_UPLOADS)
+        st.session_state.sub_dict = build_sub_dict(st.session_state.user_vars)
+        st.session_state.key_value_file_name = "key_value.hocon"
+
+    for kind in ("agents", "functions", "vars", "network"):
+        st.session_state.revisions.touch(kind)
+
+
+def start_session():
+    """Restore the session named in the URL, or name a new one, and start recording its changes."""
+    store = get_session_store()
+    if store is None:
+        return
+
+    session = st.query_params.get("session")
+    if session:
+        state = store.load(session)
+        if state:
+            restore(state)
+    else:
+        session = st.query_params["session"] = uuid.uuid4().hex
+
+    st.session_state.autosave_session = session
+    st.session_state.revisions.on_touch = record_change
@@ -0,0 +1,178 @@
+"""Opt-in performance diagnostics, enabled with the ``?diagnostics=1`` query parameter.
+
+Records the wall time of every full rerun and of each tab function in it,
+counts the ``st.rerun()`` calls each interaction triggers, and can capture
+a cProfile of the next reruns for download.
+"""
+import collections
+import contextlib
+import cProfile
+import io
+import marshal
+import pickle
+import pstats
+import sys
+import time
+
+import streamlit as st
+
+HISTORY = 50  # Interactions kept per session
+
+
+class Diagnostics:
+    """Per-session timings of the last interactions.
+
+    An interaction is a rerun started by the user, together with the reruns
+    that the app itself requested with ``rerun`` while handling it.
+    """
+
+    def __init__(self):
+        self.interactions = collections.deque(maxlen=HISTORY)
+        self.current_run = None
+        self.rerun_requested = False
+        self.profile_remaining = 0
+        self.profiler = None
+        self.profile_stats = None
+        self.profiled_runs = 0
+
+    def start_run(self):
+        if self.rerun_requested and self.interactions:
+            interaction = self.interactions[-1]
+        else:
+            interaction = {"started": time.strftime("%H:%M:%S"), "runs": 0, "reruns": 0, "seconds": 0.0, "tabs": {}}
+            self.interactions.append(interaction)
+        self.rerun_requested = False
+        interaction["runs"] += 1
+        self.current_run = interaction
+
+        if self.profile_remaining > 0:
+            self.profiler = cProfile.Profile()
+            try:
+                self.profiler.enable()
+            except ValueError:  # Another session is being profiled (one profiler per process on Python 3.12+)
+                self.profiler = None
+        return time.perf_counter()
+
+    def end_run(self, start):
+        self.current_run["seconds"] += time.perf_counter() - start
+        if self.profiler is not None:
+            self.profiler.disable()
+            stats = pstats.Stats(self.profiler)
+            if self.profile_stats is None:
+                self.profile_stats = stats
+            else:
+                self.profile_stats.add(stats)
+            self.profiler = None
+            self.profile_remaining -= 1
+            self.profiled_runs += 1
+
+    def add_tab_time(self, name, seconds):
+        tabs = self.current_run["tabs"]
+        tabs[name] = tabs.get(name, 0.0) + seconds
+
+    def profile_dump(self):
+        """Return the collected profile in the binary format read by ``pstats`` and snakeviz."""
+        return marshal.dumps(self.profile_stats.stats)
+
+    def profile_summary(self, limit=25):
+        stream = io.StringIO()
+        stats = pstats.Stats(stream=stream)
+        stats.add(self.profile_stats)
+        stats.sort_stats("cumulative").print_stats(limit)
+        return stream.getvalue()
+
+
+def enabled():
+    return st.query_params.get("diagnostics") not in (None, "", "0")
+
+
+def get_diagnostics():
+    if "diagnostics" not in st.session_state:
+        st.session_state.diagnostics = Diagnostics()
+    return st.session_state.diagnostics
+
+
+@contextlib.contextmanager
+def record_run():
+    """Time a full rerun of the app; the time is recorded even when the run ends with ``st.rerun()``."""
+    if not enabled():
+        yield
+        return
+    diagnostics = get_diagnostics()
+    start = diagnostics.start_run()
+    try:
+        yield
+    finally:
+        diagnostics.end_run(start)
+
+
+@contextlib.contextmanager
+def timed(name):
+    """Add the time spent in the block to the tab timings of the current run."""
+    diagnostics = st.session_state.get("diagnostics")
+    if diagnostics is None or diagnostics.current_run is None or not enabled():
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        diagnostics.add_tab_time(name, time.perf_counter() - start)
+
+
+def rerun(scope="app"):
+    """``st.rerun`` that is counted against the interaction that requested it."""
+    diagnostics = st.session_state.get("diagnostics")
+    if diagnostics is not None and diagnostics.current_run is not None:
+        diagnostics.current_run["reruns"] += 1
+        diagnostics.rerun_requested = scope == "app"
+    st.rerun(scope=scope)
+
+
+def value_size(value):
+    try:
+        return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+    except Exception:  # Futures, locks and other values that cannot be pickled
+        return sys.getsizeof(value)
+
+
+def diagnostics_tab_content():
+    diagnostics = get_diagnostics()
+    st.title("Diagnostics")
+
+    st.subheader("Interactions")
+    rows = [
+        {
+            "started": interaction["started"],
+            "runs": interaction["runs"],
+            "st.rerun() calls": interaction["reruns"],
+            "total ms": round(interaction["seconds"] * 1000, 1),
+            **{f"{name} ms": round(seconds * 1000, 1) for name, seconds in interaction["tabs"].items()},
+        }
+        for interaction in reversed(diagnostics.interactions)
+    ]
+    st.dataframe(rows, hide_index=True)
+    st.caption("Fragment reruns are not included; they only rerun their own part of the page.")
+
+    st.subheader("Session state")
+    sizes = sorted(((value_size(st.session_state[key]), key) for key in list(st.session_state.keys())), reverse=True)
+    st.metric("Total size", f"{sum(size for size, _ in sizes) / 1024:,.1f} KiB")
+    st.dataframe([{"key": key, "bytes": size} for size, key in sizes[:15]], hide_index=True)
+
+    st.subheader("Profile")
+    left, right = st.columns([1, 1], vertical_alignment="bottom")
+    with left:
+        runs = st.number_input("Reruns to profile", min_value=1, max_value=50, value=5, key="profile_runs")
+    with right:
+        if st.button("⏺️ Profile next reruns", key="start_profile"):
+            diagnostics.profile_remaining = runs
+            diagnostics.profile_stats = None
+            diagnostics.profiled_runs = 0
+
+    if diagnostics.profile_remaining:
+        st.info(f"Profiling the next {diagnostics.profile_remaining} reruns.")
+    if diagnostics.profile_stats is not None:
+        st.caption(f"Profile of {diagnostics.profiled_runs} reruns")
+        st.code(diagnostics.profile_summary(), language=None)
+        st.download_button("💾 Download profile", data=diagnostics.profile_dump(), file_name="hocon_editor.prof",
+                           mime="application/octet-stream")
@@ -0,0 +1,76 @@
+import concurrent.futures
+
+import streamlit as st
+
+from diagnostics import rerun
+from hocon_core import WRITERS, output_file_name
+
+MIME_TYPES = {"hocon": "text/plain", "json": "application/json", "yaml": "application/yaml"}
+
+# Exports of every session share one small pool, so a large network never blocks the script thread
+executor = concurrent.futures.ThreadPoolExecutor(max_workers=2, thread_name_prefix="hocon-export")
+
+
+def start_export(name, kinds, snapshot):
+    """Build an export on the worker, unless the same state is already being or has been exported.
+
+    The job is a view of the revision store, so it is cached by the revisions
+    of ``kinds`` and dropped when the session is compacted. ``snapshot()``
+    runs in the script thread and returns the function run on the worker; it
+    must capture copies of anything that callbacks change in place.
+    """
+    st.session_state.revisions.derive(f"{name}_export", kinds, lambda: executor.submit(snapshot()))
+
+
+@st.fragment(run_every=0.5)
+def wait_for_export(name, kinds):
+    """Poll a running export and rerun the app once it is done."""
+    future = st.session_state.revisions.peek(f"{name}_export", kinds)
+    if future is None or future.done():
+        rerun()
+    st.caption("⏳ Preparing file...")
+
+
+def export_result(name, kinds):
+    """Return ``(done, text)`` for the export of the current state; ``(False, None)`` if there is none."""
+    future = st.session_state.revisions.peek(f"{name}_export", kinds)
+    if future is None:  # Nothing prepared, or prepared before the last edit
+        return False, None
+    if not future.done():
+        return False, future
+    if future.exception() is not None:
+        st.error(f"An error occurred while preparing the file: {future.exception()}")
+        st.session_state.revisions.discard(f"{name}_export")
+        return False, None
+    return True, future.result()
+
+
+def refresh_stale_downloads():
+    """Rerun the app when a download button on screen serves a file prepared before the last edit.
+
+    Edit fragments call this first thing: their edits only rerun themselves,
+    so the export fragments would otherwise keep showing the old file.
+    """
+    shown = st.session_state.get("shown_downloads", {})
+    if any(st.session_state.revisions.peek(f"{job}_export", kinds) is None for job, kinds in shown.items()):
+        rerun()
+
+
+def export_controls(name, kinds, prepare_label, download_label, file_name, snapshot, disabled=False):
+    """Format choice, prepare button and, once the worker has built the file for the current state, the download button.
+
+    ``snapshot(output_format)`` is called with one of ``WRITERS``; each format is prepared and cached on its own.
+    """
+    output_format = st.selectbox("Format", list(WRITERS), key=f"format_{name}", format_func=str.upper)
+    job = f"{name}_{output_format}"
+    if st.button(prepare_label, key=f"prepare_{name}", disabled=disabled):
+        start_export(job, kinds, lambda: snapshot(output_format))
+
+    if disabled:
+        return
+    done, result = export_result(job, kinds)
+    if done:
+        st.session_state.shown_downloads[job] = kinds
+        st.download_button(label=download_label, data=result, file_name=output_file_name(file_name, output_format), mime=MIME_TYPES[output_format])
+    elif result is not None:
+        wait_for_export(job, kinds)
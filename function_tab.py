@@ -1,227 +1,254 @@
-from pyhocon import ConfigFactory, HOCONConverter
 import streamlit as st
 
+from diagnostics import rerun
+from export_jobs import export_controls, refresh_stale_downloads
+from hocon_core import build_function_result, load_function_config, new_function, new_parameter, parse_file_bytes, write_text
+from sections import lazy_section
+
 TYPES = ['string', 'float', 'int', 'object', 'array', 'boolean']
 
 
-def function_tab_content():
+def build_results():
+    functions = st.session_state.functions
+    entries = st.session_state.revisions.derive_each(
+        "function_result", "functions", functions, lambda key, func: build_function_result(func))
+    return {functions[key]['name']: entry for key, entry in entries.items() if functions[key]['name']}
 
-    # Initialize session state variables
-    if "functions" not in st.session_state:
-        st.session_state.functions = {}
-        st.session_state.function_errors = {}  # Store validation errors
-        st.session_state.function_results = {}
-        st.session_state.function_file_name = "function.hocon"
 
-    # Function to add a new input box
-    def add_input():
-        new_key = max(st.session_state.functions.keys(), default=-1) + 1
-        st.session_state.functions[new_key] = {"name": "", "description": "", "parameters": {"type": "object", "properties": {}, "required": []}, "module": "", "class": ""}
-        st.session_state.function_errors[new_key] = ""  # Initialize error tracking
+def refresh_function_results():
+    # Rebuilt only after a function changed, and then only the changed functions
+    st.session_state.function_results = st.session_state.revisions.derive("function_results", ("functions",), build_results)
 
-    # Function to add a new parameter
-    def add_param(function_key_index: int):
-        new_key = max(st.session_state.functions[function_key_index]['parameters']['properties'].keys(), default=-1) + 1
-        # st.session_state.functions[function_key_index]['parameters']['properties'][new_key] = {"name": "", "type": [], "description": ""}
-        st.session_state.functions[function_key_index]['parameters']['properties'][new_key] = {"name": "", "type": "", "description": ""}
 
-    # Function to remove a specific input box
-    def remove_input(input_key: int):
-        if len(st.session_state.functions) >= 1:
-            del st.session_state.functions[input_key]
-            del st.session_state.function_errors[input_key]  # Remove associated error
-            st.rerun()  # Forces immediate UI update
+def touch_function(*keys):
+    st.session_state.revisions.touch("functions", *keys)
 
-    # Function to remove a specific parameter
-    def remove_param(function_key_index: int, param_key_index: int):
-        if len(st.session_state.functions[function_key_index]['parameters']['properties']) >= 1:
-            del st.session_state.functions[function_key_index]['parameters']['properties'][param_key_index]
-            st.rerun()  # Forces immediate UI update
 
+# Function to add a new input box
+def add_input():
+    new_key = max(st.session_state.functions.keys(), default=-1) + 1
+    st.session_state.functions[new_key] = new_function()
+    st.session_state.function_errors[new_key] = ""  # Initialize error tracking
+    touch_function(new_key)
 
-    st.title("Functions Input Fields")
 
-    input_keys = list(st.session_state.functions.keys())  # Store keys to avoid modifying while iterating
+# Function to add a new parameter
+def add_param(function_key_index: int):
+    new_key = max(st.session_state.functions[function_key_index]['parameters']['properties'].keys(), default=-1) + 1
+    st.session_state.functions[function_key_index]['parameters']['properties'][new_key] = new_parameter()
+    touch_function(function_key_index)
 
-    to_remove = None  # Store key to remove
-    require_change = False
-    existing_pairs = {(item["module"], item["class"]) for item in st.session_state.functions.values()}
 
-    for key in input_keys:
-        cols = st.columns([1000, 1])
-        with cols[0]:
-            prev_func_name = st.session_state.functions[key]["name"]
-            new_func_name = st.text_input(
-                label="Function name",
-                value=st.session_state.functions[key]["name"],
-                key=f"func_name_{key}",
-                help="This is used as a reference to agents only, and is not included in the HOCON file."
-            )
-            if new_func_name != prev_func_name:
-                st.session_state.functions[key]["name"] = new_func_name
-                st.rerun()
-
-            prev_desc = st.session_state.functions[key]["description"]
-            # Function description input
-            new_desc = st.text_area(
-                "Function description",
-                value=st.session_state.functions[key]["description"],
-                key=f"description_{key}",
-                help="Description of function or role of the agent",
-            )
-            if new_desc != prev_desc:
-                st.session_state.functions[key]["description"] = new_desc
-                st.rerun()
+# Function to remove a specific input box
+def remove_input(input_key: int):
+    if len(st.session_state.functions) >= 1:
+        del st.session_state.functions[input_key]
+        st.session_state.function_errors.pop(input_key, None)  # Remove associated error
+        touch_function(input_key)
+        refresh_function_results()
 
-        with cols[1]:
-            if st.button("❌", key=f"remove_function_{key}"):
-                to_remove = key  # Mark for removal
 
-        # Parameter section
-        param_keys = list(st.session_state.functions[key]["parameters"]["properties"].keys())
-        to_remove_param = None
+# Function to remove a specific parameter
+def remove_param(function_key_index: int, param_key_index: int):
+    if len(st.session_state.functions[function_key_index]['parameters']['properties']) >= 1:
+        del st.session_state.functions[function_key_index]['parameters']['properties'][param_key_index]
+        touch_function(function_key_index)
+        refresh_function_results()
 
-        for param_key in param_keys:
-            param_cols = st.columns([4, 1])
 
-            # Track expander state manually
-            expander_func_key = f"expander_{key}_{param_key}"
-            if expander_func_key not in st.session_state:
-                st.session_state[expander_func_key] = False  # Default to collapsed
+def set_function_field(key: int, field: str, widget_key: str):
+    st.session_state.functions[key][field] = st.session_state[widget_key]
+    touch_function(key)
+    refresh_function_results()
 
-            with param_cols[0]:
-                param_name = st.session_state.functions[key]["parameters"]["properties"][param_key]["name"]
-                with st.expander(f"Parameter: {param_name if param_name else ''}", expanded=st.session_state[expander_func_key]) as expander:
-                    new_param_name = st.text_input(
+
+def set_param_field(key: int, param_key: int, field: str, widget_key: str):
+    st.session_state.functions[key]["parameters"]["properties"][param_key][field] = st.session_state[widget_key]
+    st.session_state[f"expander_{key}_{param_key}"] = True  # Keep open while editing
+    touch_function(key)
+    refresh_function_results()
+
+
+def set_required(key: int):
+    st.session_state.functions[key]['parameters']['required'] = st.session_state[f'required_{key}']
+    touch_function(key)
+    refresh_function_results()
+
+
+def set_class_path(key: int):
+    new_module = st.session_state[f"module_{key}"]
+    new_class = st.session_state[f"class_{key}"]
+    existing_pairs = {(item["module"], item["class"]) for k, item in st.session_state.functions.items() if k != key}
+
+    # Check uniqueness of (module, class) pair
+    if (new_module, new_class) in existing_pairs:
+        st.session_state.function_errors[key] = f"❌ '{new_module}.{new_class}' is already used. Choose a different module or class."
+    else:
+        st.session_state.function_errors[key] = ""  # Clear error if valid
+        st.session_state.functions[key]["module"] = new_module
+        st.session_state.functions[key]["class"] = new_class
+        touch_function(key)
+        refresh_function_results()
+
+
+@st.fragment
+def function_details(key: int):
+    """Description, parameters and class of one function."""
+    func = st.session_state.functions.get(key)
+    if func is None:
+        return
+    refresh_stale_downloads()
+
+    # Function description input
+    st.text_area(
+        "Function description",
+        value=func["description"],
+        key=f"description_{key}",
+        help="Description of function or role of the agent",
+        on_change=set_function_field, args=(key, "description", f"description_{key}"),
+    )
+
+    # Parameter section
+    param_keys = list(func["parameters"]["properties"].keys())
+
+    for param_key in param_keys:
+        param = func["parameters"]["properties"][param_key]
+        param_cols = st.columns([4, 1])
+
+        with param_cols[0]:
+            # A collapsed parameter only sends its summary; its widgets are built when opened
+            summary = f"{param['type'] or 'no type'} · {param['description'][:60] or 'no description'}"
+            with lazy_section(f"Parameter: {param['name']}", f"expander_{key}_{param_key}", summary) as is_open:
+                if is_open:
+                    st.text_input(
                         label="Parameter name",
                         key=f"input_{key}_param_name_{param_key}",
-                        value=st.session_state.functions[key]["parameters"]["properties"][param_key]["name"],
+                        value=param["name"],
+                        on_change=set_param_field, args=(key, param_key, "name", f"input_{key}_param_name_{param_key}"),
                     )
-                    # Update session state only if name changes
-                    if new_param_name != param_name:
-                        st.session_state.functions[key]["parameters"]["properties"][param_key]["name"] = new_param_name
-                        st.session_state[expander_func_key] = True  # Force open when renaming
-                        st.rerun()
 
                     def safe_index(lst, item):
                         return lst.index(item) if item in lst else None
-                    # new_types = st.multiselect(
-                    #     label="Parameter type",
-                    #     options=TYPES,
-                    #     default=st.session_state.functions[key]["parameters"]["properties"][param_key]["type"],
-                    #     key=f"input_{key}_param_type_{param_key}",
-                    # )
-                    new_types = st.selectbox(
+
+                    st.selectbox(
                         label="Parameter type",
                         options=TYPES,
-                        index=safe_index(TYPES, st.session_state.functions[key]["parameters"]["properties"][param_key]["type"]),
+                        index=safe_index(TYPES, param["type"]),
                         key=f"input_{key}_param_type_{param_key}",
+                        on_change=set_param_field, args=(key, param_key, "type", f"input_{key}_param_type_{param_key}"),
                     )
-                    if new_types != st.session_state.functions[key]["parameters"]["properties"][param_key]["type"]:
-                        st.session_state.functions[key]["parameters"]["properties"][param_key]["type"] = new_types
-                        st.session_state[expander_func_key] = True
-                        st.rerun()
-
-                    prev_prop_desc = st.session_state.functions[key]["parameters"]["properties"][param_key]["description"]
-                    new_prop_desc = st.text_area(
+                    st.text_area(
                         label="Parameter description",
                         key=f"input_{key}_param_desc_{param_key}",
-                        value=st.session_state.functions[key]["parameters"]["properties"][param_key]["description"],
+                        value=param["description"],
+                        on_change=set_param_field, args=(key, param_key, "description", f"input_{key}_param_desc_{param_key}"),
                     )
-                    if new_prop_desc != prev_prop_desc:
-                        st.session_state.functions[key]["parameters"]["properties"][param_key]["description"] = new_prop_desc
-                        st.session_state[expander_func_key] = True  # Force open when renaming
-                        st.rerun()
-
-            # Allow manual collapsing
-            if not expander:  # If user collapses manually
-                st.session_state[expander_func_key] = False
-
-            with param_cols[1]:
-                if st.button("❌", key=f"remove_param_{key}_{param_key}"):
-                    to_remove_param = param_key  # Mark for removal
-
-            # Remove param field if button was pressed
-            if to_remove_param is not None:
-                remove_param(key, to_remove_param)
-
-        # Button for adding parameters
-        st.button(
-            "➕ Add param",
-            on_click=lambda k=key: add_param(k),
-            key=f"add_param_{key}",
+
+        with param_cols[1]:
+            st.button("❌", key=f"remove_param_{key}_{param_key}", on_click=remove_param, args=(key, param_key))
+
+    # Button for adding parameters
+    st.button(
+        "➕ Add param",
+        on_click=add_param, args=(key,),
+        key=f"add_param_{key}",
+    )
+
+    module_cols = st.columns([4, 1])
+    # Expander for module and class selection
+    with module_cols[0]:
+        param_options = [
+            param["name"]
+            for param in func["parameters"]["properties"].values()
+            if param["name"] != ""
+            ]
+        required = [conn for conn in func['parameters']['required'] if conn in param_options]
+        if required != func['parameters']['required']:  # A required parameter was renamed or removed
+            func['parameters']['required'] = required
+            touch_function(key)
+            refresh_function_results()
+        st.multiselect(
+            label='Required parameter',
+            options=param_options,
+            default=func['parameters']['required'],
+            key=f'required_{key}',
+            help='Required parameters',
+            on_change=set_required, args=(key,),
         )
 
-        st.session_state.function_errors[key] = ''
-
-        module_cols = st.columns([4, 1])
-        # Expander for module and class selection
-        with module_cols[0]:
-            param_options = [
-                param["name"]
-                for param in st.session_state.functions[key]["parameters"]["properties"].values()
-                if param["name"] != ""
-                ]
-            filtered_options = [conn for conn in st.session_state.functions[key]['parameters']['required'] if conn in param_options]
-            if filtered_options != st.session_state.functions[key]['parameters']['required']:
-                st.session_state.functions[key]['parameters']['required'] = filtered_options
-                require_change = True  # Mark as changed
-            required = st.multiselect(
-                label='Required parameter',
-                options=param_options,
-                default=st.session_state.functions[key]['parameters']['required'],
-                key=f'required_{key}',
-                help='Required parameters'
-            )
+        st.text_input(
+            "Module",
+            value=func["module"],
+            key=f"module_{key}",
+            help="Module of the function",
+            on_change=set_class_path, args=(key,),
+        )
+        st.text_input(
+            "Class",
+            value=func["class"],
+            key=f"class_{key}",
+            help="Class of the function",
+            on_change=set_class_path, args=(key,),
+        )
 
-            if required != st.session_state.functions[key]['parameters']['required']:
-                st.session_state.functions[key]['parameters']['required'] = required
-                require_change = True
+        # Display inline error
+        if st.session_state.function_errors.get(key):
+            st.error(st.session_state.function_errors[key])
 
-            prev_module = st.session_state.functions[key]["module"]
-            prev_class = st.session_state.functions[key]["class"]
 
-            new_module = st.text_input(
-                "Module",
-                value=prev_module,
-                key=f"module_{key}",
-                help="Module of the function",
-            )
-            new_class = st.text_input(
-                "Class",
-                value=prev_class,
-                key=f"class_{key}",
-                help="Class of the function",
-            )
+def set_function_file_name():
+    st.session_state.function_file_name = st.session_state.function_file_name_input
 
-            # Check uniqueness of (module, class) pair
-            new_pair = (new_module, new_class)
-            prev_pair = (prev_module, prev_class)
 
-            if new_pair != prev_pair:
-                if new_pair in existing_pairs:
-                    st.session_state.function_errors[key] = f"❌ '{new_module}.{new_class}' is already used. Choose a different module or class."
-                else:
-                    st.session_state.function_errors[key] = ""  # Clear error if valid
-                    existing_pairs.discard(prev_pair)  # Remove old value
-                    existing_pairs.add(new_pair)  # Add new value
-                    st.session_state.functions[key]["module"] = new_module
-                    st.session_state.functions[key]["class"] = new_class
-                    st.rerun()  # Force UI refresh only after all updates
+def function_snapshot(output_format):
+    refresh_function_results()
+    results = st.session_state.function_results  # Replaced, never edited in place
+    return lambda: write_text(results, output_format)
 
-            # Display inline error
-            if st.session_state.function_errors.get(key):
-                st.error(st.session_state.function_errors[key])
 
-        st.divider()
+@st.fragment
+def function_export():
+    """Build the function spec file on the export worker only when asked."""
+    st.text_input("Enter filename", st.session_state.function_file_name,
+                  key="function_file_name_input", on_change=set_function_file_name)
+
+    # Converted again only after a function changed
+    export_controls("functions", ("functions",),
+                    "📄 Prepare function spec", "💾 Download function spec",
+                    st.session_state.function_file_name, function_snapshot)
+
+
+def function_tab_content():
+
+    # Initialize session state variables
+    if "functions" not in st.session_state:
+        st.session_state.functions = {}
+        st.session_state.function_errors = {}  # Store validation errors
+        st.session_state.function_results = {}
+        st.session_state.function_file_name = "function.hocon"
+
+    st.title("Functions Input Fields")
 
-    # Remove input field if button was pressed
-    if to_remove is not None:
-        remove_input(to_remove)
+    input_keys = list(st.session_state.functions.keys())  # Store keys to avoid modifying while iterating
 
-    # Trigger rerun if required param changed
-    if require_change:
-        st.rerun()
+    for key in input_keys:
+        cols = st.columns([1000, 1])
+        with cols[0]:
+            # Renaming changes the function options of every agent, so it reruns the whole app
+            st.text_input(
+                label="Function name",
+                value=st.session_state.functions[key]["name"],
+                key=f"func_name_{key}",
+                help="This is used as a reference to agents only, and is not included in the HOCON file.",
+                on_change=set_function_field, args=(key, "name", f"func_name_{key}"),
+            )
+
+        with cols[1]:
+            st.button("❌", key=f"remove_function_{key}", on_click=remove_input, args=(key,))
+
+        function_details(key)
+
+        st.divider()
 
     # Buttons for adding inputs
     col1, col2 = st.columns([1, 2], vertical_alignment='center')
@@ -241,77 +268,20 @@ def function_tab_content():
 
                 try:
                     # Attempt to load as a HOCON or CONF file
-                    if uploaded_file.name.endswith(".hocon") or uploaded_file.name.endswith(".conf") or uploaded_file.name.endswith(".json"):
-                        config = ConfigFactory.parse_string(uploaded_file.getvalue().decode("utf-8"))
-                    else:
-                        st.error("Unsupported file format!")
-
+                    config = parse_file_bytes(uploaded_file.name, uploaded_file.getvalue())
                 except Exception as e:
                     st.error(f"An error occurred while loading the file: {e}")
+                else:
+                    functions = load_function_config(config, st.session_state.functions)
+                    for new_key in functions.keys() - st.session_state.functions.keys():
+                        st.session_state.function_errors[new_key] = ""  # Initialize error tracking
+                    st.session_state.functions = functions
+                    touch_function()
 
-                for func_name, func_dict in config.items():
-                    add_input()
-                    new_key = max(st.session_state.functions.keys())  # Faster than list()[-1]
-
-                    function_data = func_dict.get('function', {})
-                    parameters = function_data.get('parameters', {})
-                    properties = parameters.get('properties', {})
-
-                    st.session_state.functions[new_key]['name'] = func_name
-                    st.session_state.functions[new_key]['description'] = function_data.get('description', '')
-
-                    class_path = func_dict.get('class', '').split('.')
-                    st.session_state.functions[new_key]['module'] = class_path[0] if len(class_path) > 1 else ''
-                    st.session_state.functions[new_key]['class'] = class_path[1] if len(class_path) > 1 else ''
-
-                    st.session_state.functions[new_key]['parameters']['required'] = parameters.get('required', [])
-
-                    for param_index, (p_name, p_val) in enumerate(properties.items()):
-                        add_param(new_key)
-                        param_entry = st.session_state.functions[new_key]['parameters']['properties'][param_index]
-                        param_entry['name'] = p_name
-                        param_entry['type'] = p_val.get('type', '')
-                        param_entry['description'] = p_val.get('description', '')
-
-                st.session_state.existing_files.append(file_id)
-                st.rerun()
-
-    results = {
-        v['name']: {
-            'function': {
-                "description": v["description"],
-                "parameters": {
-                    "type": v["parameters"]["type"],
-                    "properties": {
-                        param["name"]: {"type": param["type"], "description": param["description"]}
-                        for param in v["parameters"]["properties"].values()
-                        if param["name"]  # Ensuring 'name' is not empty
-                    } if v["parameters"]["properties"] else {},  # Allow empty 'properties'
-                    "required": v["parameters"].get("required", [])
-                },
-            },
-            'class': "" if not v["module"] and not v["class"] else f"{v['module']}.{v['class']}"
-        }
-        for v in st.session_state.functions.values() if v['name']
-    }
-
-    if results != st.session_state.function_results:
-        st.session_state.function_results = results
-        st.rerun()
-
-    # Convert dictionary to HOCON config
-    config = ConfigFactory.from_dict(st.session_state.function_results)
-
-    # Convert to HOCON format and write to file
-    hocon_str = HOCONConverter.convert(config, "hocon")
-
-    filename = st.text_input("Enter filename", st.session_state.function_file_name)
-    if filename != st.session_state.function_file_name:
-        st.session_state.function_file_name = filename
-
-    st.download_button(
-        label="💾 Download function spec as HOCON File",
-        data=hocon_str,
-        file_name=st.session_state.function_file_name,
-        mime="text/plain",
-    )
+                st.session_state.existing_files.put(file_id, True)
+                rerun()
+
+    # The sidebar renders after this tab, so it sees the up-to-date results in the same run; a no-op if nothing changed
+    refresh_function_results()
+
+    function_export()
@@ -0,0 +1,231 @@
+"""Benchmarks of the editor's hot paths on synthetic networks.
+
+Every benchmark runs cold: the process-wide caches are cleared before each
+repetition, so the numbers show the work of a first load or export. Peak
+memory is measured with tracemalloc in a separate run. Timings depend on
+the machine, so compare against a baseline recorded on the same one.
+
+Examples:
+    python hocon_bench.py
+    python hocon_bench.py --sizes 100,1000,5000 --output benchmarks/baseline.json
+    python hocon_bench.py --baseline benchmarks/baseline.json --tolerance 0.3
+"""
+import argparse
+import gc
+import json
+import platform
+import sys
+import time
+import tracemalloc
+
+from pyhocon import ConfigFactory, HOCONConverter
+
+from hocon_core import (RevisionStore, SearchIndex, build_network_data, build_sub_dict, clear_substitution_caches,
+                        default_fragment_cache, force_layout, layered_layout, load_function_config, load_network_config,
+                        network_topology, parse_cache, parse_hocon, remove_empty_values, replace_strings_in_nested_dict,
+                        replace_value_with_key, serialize_network, synthetic_workload, to_hocon, write_text)
+
+NOISE_FLOOR = 0.005  # Seconds; smaller differences are not reported as regressions
+SEARCH_QUERIES = ("agent_4", "refund", "customer order", "st", "policy review status", "nothing like this")
+
+
+def clear_caches():
+    parse_cache.clear()
+    default_fragment_cache.clear()
+    clear_substitution_caches()
+
+
+def build_search_index(state, functions, user_vars):
+    index, revisions = SearchIndex(), RevisionStore()
+    index.sync(revisions, "agents", state["inputs"])
+    index.sync(revisions, "functions", functions)
+    index.sync(revisions, "vars", user_vars)
+    return index
+
+
+def prepare(workload):
+    """Turn a workload into the inputs of the benchmarks, the way the editor would hold them."""
+    network_text = to_hocon(workload["network"])
+    config = parse_hocon(network_text)
+    user_vars = {i: {"var": k, "sub_value": v} for i, (k, v) in enumerate(workload["vars"].items())}
+    sub_dict = build_sub_dict(user_vars)
+    functions = load_function_config(workload["functions"])
+    state = load_network_config(config, sub_dict, functions)
+    strings = [agent["instructions"] for agent in workload["network"]["tools"]]
+    return {
+        "text": network_text,
+        "config": config,
+        "sub_dict": sub_dict,
+        "state": state,
+        "strings": strings,
+        "data": build_network_data(state["inputs"], state["llm_model"], state["temperature"], sub_dict),
+        "functions": functions,
+        "user_vars": user_vars,
+        "search_index": build_search_index(state, functions, user_vars),
+    }
+
+
+def bench_parse(p):
+    return lambda: parse_hocon(p["text"])
+
+
+def bench_load_network(p):
+    return lambda: load_network_config(p["config"], p["sub_dict"])
+
+
+def bench_replace_value_with_key(p):
+    return lambda: [replace_value_with_key(text, p["sub_dict"]) for text in p["strings"]]
+
+
+def bench_replace_strings_in_nested_dict(p):
+    return lambda: replace_strings_in_nested_dict(p["state"]["inputs"], p["sub_dict"])
+
+
+def bench_remove_empty_values(p):
+    return lambda: remove_empty_values(p["state"]["inputs"])
+
+
+def bench_to_hocon(p):
+    return lambda: to_hocon(p["data"])
+
+
+def bench_to_hocon_pyhocon(p):
+    # The ConfigTree round trip that to_hocon replaced, kept as the reference
+    return lambda: HOCONConverter.convert(ConfigFactory.from_dict(p["data"]), "hocon")
+
+
+def bench_to_json(p):
+    return lambda: write_text(p["data"], "json")
+
+
+def bench_to_yaml(p):
+    return lambda: write_text(p["data"], "yaml")
+
+
+def bench_serialize_network(p):
+    state = p["state"]
+    return lambda: serialize_network(state["inputs"], state["llm_model"], state["temperature"], p["sub_dict"])
+
+
+def bench_layered_layout(p):
+    return lambda: layered_layout(*network_topology(p["state"]["inputs"]))
+
+
+def bench_force_layout(p):
+    return lambda: force_layout(*network_topology(p["state"]["inputs"]))
+
+
+def bench_build_search_index(p):
+    return lambda: build_search_index(p["state"], p["functions"], p["user_vars"])
+
+
+def bench_search(p):
+    return lambda: [p["search_index"].search(query) for query in SEARCH_QUERIES]
+
+
+BENCHMARKS = {
+    'parse': bench_parse,
+    'load_network': bench_load_network,
+    'replace_value_with_key': bench_replace_value_with_key,
+    'replace_strings_in_nested_dict': bench_replace_strings_in_nested_dict,
+    'remove_empty_values': bench_remove_empty_values,
+    'to_hocon': bench_to_hocon,
+    'to_hocon_pyhocon': bench_to_hocon_pyhocon,
+    'to_json': bench_to_json,
+    'to_yaml': bench_to_yaml,
+    'serialize_network': bench_serialize_network,
+    'layered_layout': bench_layered_layout,
+    'force_layout': bench_force_layout,
+    'build_search_index': bench_build_search_index,
+    'search': bench_search,
+}
+
+
+def measure(func, repeat):
+    """Return the best wall time of ``repeat`` cold runs and the peak traced memory of one more."""
+    timings = []
+    for _ in range(repeat):
+        clear_caches()
+        gc.collect()
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    clear_caches()
+    gc.collect()
+    tracemalloc.start()
+    func()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def run_benchmarks(args):
+    results = {}
+    for size in args.sizes:
+        workload = synthetic_workload(size, args.fan_out, args.functions, args.params, args.variables, args.seed)
+        prepared = prepare(workload)
+        for name in args.only or BENCHMARKS:
+            seconds, peak = measure(BENCHMARKS[name](prepared), args.repeat)
+            results[f"{name}@{size}"] = {"seconds": round(seconds, 6), "peak_kib": round(peak / 1024)}
+            if not args.quiet:
+                print(f"{name:<32}{size:>8}{seconds * 1000:>12.1f} ms{peak / 1024 / 1024:>10.1f} MiB", file=sys.stderr)
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """Return a message per benchmark that got slower or bigger than ``tolerance`` allows."""
+    regressions = []
+    for key, old in baseline.items():
+        new = results.get(key)
+        if new is None:
+            continue
+        if new["seconds"] > old["seconds"] * (1 + tolerance) and new["seconds"] - old["seconds"] > NOISE_FLOOR:
+            regressions.append(f"{key}: {old['seconds'] * 1000:.1f} ms -> {new['seconds'] * 1000:.1f} ms")
+        if new["peak_kib"] > old["peak_kib"] * (1 + tolerance) and new["peak_kib"] - old["peak_kib"] > 64:
+            regressions.append(f"{key}: peak {old['peak_kib']} KiB -> {new['peak_kib']} KiB")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=lambda value: [int(size) for size in value.split(',')], default=[100, 1000],
+                        help='Comma-separated numbers of agents')
+    parser.add_argument('--fan-out', type=int, default=3, help='Agents called by each agent')
+    parser.add_argument('--functions', type=int, default=20, help='Distinct functions shared by the agents')
+    parser.add_argument('--params', type=int, default=3, help='Parameters per function')
+    parser.add_argument('--variables', type=int, default=50, help='Substitution variables')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per benchmark; the best one is kept')
+    parser.add_argument('--only', action='append', choices=sorted(BENCHMARKS), help='Run only this benchmark; may be repeated')
+    parser.add_argument('--output', metavar='FILE', help='Write the results as a JSON baseline')
+    parser.add_argument('--baseline', metavar='FILE', help='Compare with a JSON baseline and fail on regressions')
+    parser.add_argument('--tolerance', type=float, default=0.5, help='Allowed slowdown or memory growth, as a fraction')
+    parser.add_argument('--quiet', action='store_true', help='Do not print the results table')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args)
+
+    if args.output:
+        report = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "workload": {"fan_out": args.fan_out, "functions": args.functions, "params": args.params,
+                         "variables": args.variables, "seed": args.seed},
+            "results": results,
+        }
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            regressions = compare(results, json.load(f)["results"], args.tolerance)
+        for message in regressions:
+            print(f"regression: {message}", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
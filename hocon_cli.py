@@ -0,0 +1,109 @@
+"""Batch conversion of agent networks, function libraries and key/value files.
+
+Examples:
+    python hocon_cli.py network --vars key_value.hocon --out-dir build/ networks/*.hocon
+    python hocon_cli.py network --check networks/*.hocon
+    python hocon_cli.py functions --out-dir build/ functions/*.hocon
+    python hocon_cli.py vars --out-dir build/ key_value.hocon
+    python hocon_cli.py network --format yaml --out-dir build/ networks/*.hocon
+"""
+import argparse
+import os
+import sys
+
+from hocon_core import (WRITERS, build_function_results, build_network_data, build_sub_dict, load_function_config,
+                        load_network_config, load_vars_config, output_file_name, parse_file_bytes, validate_functions,
+                        validate_network)
+
+
+def read_config(path):
+    with open(path, 'rb') as f:
+        return parse_file_bytes(path, f.read())
+
+
+def load_sub_dict(paths):
+    user_vars = {}
+    for path in paths:
+        user_vars = load_vars_config(read_config(path), user_vars)
+    return build_sub_dict(user_vars)
+
+
+def convert_network(config, sub_dict):
+    state = load_network_config(config, sub_dict)
+    errors = validate_network(state["inputs"])
+    data = build_network_data(state["inputs"], state["llm_model"], state["temperature"], sub_dict)
+    return data, errors
+
+
+def convert_functions(config, sub_dict):
+    functions = load_function_config(config)
+    return build_function_results(functions), validate_functions(functions)
+
+
+def convert_vars(config, sub_dict):
+    return build_sub_dict(load_vars_config(config)), {}
+
+
+CONVERTERS = {
+    'network': convert_network,
+    'functions': convert_functions,
+    'vars': convert_vars,
+}
+
+
+def run(args):
+    sub_dict = load_sub_dict(args.vars)
+    convert = CONVERTERS[args.kind]
+    failed = 0
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+
+    for path in args.files:
+        try:
+            data, errors = convert(read_config(path), sub_dict)
+        except Exception as e:
+            print(f"{path}: failed to load: {e}", file=sys.stderr)
+            failed += 1
+            continue
+
+        messages = [message for message in errors.values() if message]
+        for message in messages:
+            print(f"{path}: {message}", file=sys.stderr)
+        if messages:
+            failed += 1
+            continue
+
+        if args.check:
+            continue
+
+        # Written chunk by chunk, so a large network is never held as one string
+        chunks = WRITERS[args.format](data)
+        if args.out_dir:
+            out_name = output_file_name(os.path.basename(path), args.format)  # .conf input stays .conf for HOCON
+            with open(os.path.join(args.out_dir, out_name), 'w', encoding='utf-8') as f:
+                f.writelines(chunks)
+        else:
+            sys.stdout.writelines(chunks)
+            sys.stdout.write('\n')
+
+    if not args.quiet:
+        print(f"{len(args.files) - failed}/{len(args.files)} files converted", file=sys.stderr)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('kind', choices=sorted(CONVERTERS), help='Type of the input files')
+    parser.add_argument('files', nargs='+', help='HOCON, CONF or JSON files to convert')
+    parser.add_argument('--vars', action='append', default=[], metavar='FILE',
+                        help='Key/value file used for substitution; may be repeated, later files override earlier ones')
+    parser.add_argument('--out-dir', help='Directory for the converted files; defaults to stdout')
+    parser.add_argument('--format', choices=sorted(WRITERS), default='hocon', help='Output format (default: hocon)')
+    parser.add_argument('--check', action='store_true', help='Only load and validate, do not write anything')
+    parser.add_argument('--quiet', action='store_true', help='Do not print the summary line')
+    return run(parser.parse_args(argv))
+
+
+if __name__ == '__main__':
+    sys.exit(main())
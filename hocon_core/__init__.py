@@ -0,0 +1,33 @@
+"""Streamlit-free core of the HOCON editor.
+
+Everything needed to load, substitute, validate and export agent networks,
+function libraries and substitution variables lives here, so it can be used
+from the Streamlit app as well as from ``hocon_cli.py``.
+"""
+from hocon_core.agent_index import AgentIndex
+from hocon_core.blobs import BlobStore, default_blob_store
+from hocon_core.bulk import match_agents, replace_text, set_function, set_llm
+from hocon_core.cache import LRUCache
+from hocon_core.drilldown import AGGREGATE_PREFIX, aggregate_id, aggregate_parent, drilldown_view
+from hocon_core.fast_parser import UnsupportedHocon, parse_fast
+from hocon_core.function_index import FunctionIndex, function_fingerprint, function_shape
+from hocon_core.functions import (build_function_result, build_function_results, build_function_spec,
+                                  load_function_config, new_function, new_parameter, validate_functions)
+from hocon_core.hocon_io import SUPPORTED_EXTENSIONS, parse_cache, parse_file_bytes, parse_hocon, to_hocon
+from hocon_core.layout import LAYOUTS, compute_layout, force_layout, layered_layout, network_topology
+from hocon_core.llm import DEFAULT_LLM_MODEL, DEFAULT_TEMPERATURE, LLM_MODEL_DICT, LLM_MODEL_NAMES, get_key, get_value
+from hocon_core.network import build_network_data, load_network_config, new_agent, new_network_state, validate_network
+from hocon_core.paging import clamp_page, page_count, page_of, page_slice
+from hocon_core.records import Agent, Function, Parameter, Record, Var
+from hocon_core.revisions import RevisionStore
+from hocon_core.search_index import SearchIndex
+from hocon_core.serialize import content_hash, default_fragment_cache, network_text, serialize_agent, serialize_network
+from hocon_core.session_store import SessionStore, fold_changes
+from hocon_core.sessions import SessionRegistry, session_registry
+from hocon_core.substitution import (ForwardSubstituter, ReverseSubstituter, build_sub_dict, clear_substitution_caches,
+                                     default_substituter, get_reverse_substituter, load_vars_config, new_var,
+                                     remove_empty_values, replace_strings_in_nested_dict, replace_value_with_key,
+                                     resolve_sub_dict, sub_dict_version, substitution_cycles)
+from hocon_core.workload import synthetic_workload
+from hocon_core.writers import (EXTENSIONS, WRITERS, hocon_value, iter_hocon, iter_json, iter_yaml, output_file_name,
+                                write_text)
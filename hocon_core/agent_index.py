@@ -0,0 +1,99 @@
+class AgentIndex:
+    """Name-to-key map and reverse ("called by") edges of a network.
+
+    The index wraps the ``inputs`` dictionary of the editor and performs
+    add, rename, remove and connection updates on it, so each of them only
+    touches the agents connected to the changed one.
+    """
+
+    def __init__(self, inputs):
+        self.inputs = inputs
+        self.keys_by_name = {}  # Name -> keys of the agents with that name; more than one is a duplicate
+        self.called_by = {}  # Name -> keys of the agents whose tools point to it
+        self._names = None
+        for key in inputs:
+            self.add(key)
+
+    def __contains__(self, name):
+        return name in self.keys_by_name
+
+    def callers(self, name):
+        return self.called_by.get(name, set())
+
+    def names(self):
+        """Return the non-empty agent names, in the order of their first keys."""
+        if self._names is None:
+            self._names = sorted(self.keys_by_name, key=lambda name: min(self.keys_by_name[name]))
+        return self._names
+
+    def add(self, key):
+        """Index the agent stored under ``key`` in ``inputs``."""
+        agent = self.inputs[key]
+        if agent['name']:
+            self.keys_by_name.setdefault(agent['name'], set()).add(key)
+            self._names = None
+        for conn in agent['tools']:
+            self.called_by.setdefault(conn, set()).add(key)
+
+    def _drop_name(self, name, key):
+        """Unindex ``key`` under ``name``; return True if no other agent keeps the name."""
+        keys = self.keys_by_name.get(name)
+        if not name or keys is None:
+            return False
+        keys.discard(key)
+        self._names = None
+        if keys:
+            return False
+        del self.keys_by_name[name]
+        return True
+
+    def remove(self, key):
+        """Delete an agent; its callers lose the edge unless another agent has the same name."""
+        agent = self.inputs.pop(key)
+        for conn in agent['tools']:
+            self._discard_edge(conn, key)
+
+        name = agent['name']
+        if self._drop_name(name, key):
+            for caller in self.called_by.pop(name, set()):
+                self.inputs[caller]['tools'] = [conn for conn in self.inputs[caller]['tools'] if conn != name]
+
+    def rename(self, key, new_name):
+        """Rename an agent; its callers follow the new name, or lose the edge if it is empty.
+
+        While another agent keeps the old name, the callers stay with it.
+        """
+        agent = self.inputs[key]
+        old_name = agent['name']
+        agent['name'] = new_name
+        if old_name == new_name:
+            return
+
+        if self._drop_name(old_name, key):
+            callers = self.called_by.pop(old_name, set())
+            for caller in callers:
+                tools = self.inputs[caller]['tools']
+                if new_name and caller != key:
+                    self.inputs[caller]['tools'] = [new_name if conn == old_name else conn for conn in tools]
+                    self.called_by.setdefault(new_name, set()).add(caller)
+                else:
+                    self.inputs[caller]['tools'] = [conn for conn in tools if conn != old_name]
+        if new_name:
+            self.keys_by_name.setdefault(new_name, set()).add(key)
+        self._names = None
+
+    def set_tools(self, key, tools):
+        """Replace the connections of an agent and update the reverse edges."""
+        old_tools = self.inputs[key]['tools']
+        for conn in set(old_tools) - set(tools):
+            self._discard_edge(conn, key)
+        for conn in tools:
+            self.called_by.setdefault(conn, set()).add(key)
+        self.inputs[key]['tools'] = list(tools)
+
+    def _discard_edge(self, name, key):
+        callers = self.called_by.get(name)
+        if callers is not None:
+            callers.discard(key)
+            if not callers:
+                del self.called_by[name]
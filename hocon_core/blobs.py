@@ -0,0 +1,69 @@
+import hashlib
+
+from hocon_core.cache import LRUCache
+
+BLOB_MIN_SIZE = 256  # Shorter texts are cheaper to copy and hash than to intern
+
+
+class Blob:
+    __slots__ = ('text', 'digest', 'results')
+
+    def __init__(self, text):
+        self.text = text
+        self.digest = hashlib.sha1(text.encode("utf-8")).hexdigest()
+        self.results = {}  # kind -> (version, result)
+
+
+class BlobStore:
+    """Content-addressed store of the large text blocks of the editor.
+
+    Every distinct text of at least ``min_size`` characters is kept once;
+    ``intern`` hands out that copy, so agents and parameters that share an
+    instruction or a description share one string. The sha1 of each text and
+    the results computed from it, such as its substitution for the current
+    variables, are kept with it and reused by every agent that uses the text.
+    """
+
+    def __init__(self, min_size=BLOB_MIN_SIZE, maxsize=8192):
+        self.min_size = min_size
+        self._blobs = LRUCache(maxsize)  # text -> Blob
+
+    def __len__(self):
+        return len(self._blobs)
+
+    def _blob(self, text):
+        if type(text) is not str or len(text) < self.min_size:
+            return None
+        blob = self._blobs.get(text)
+        if blob is None:
+            blob = Blob(text)
+            self._blobs.put(text, blob)
+        return blob
+
+    def intern(self, text):
+        """Return the stored copy of ``text``; short texts and other values are returned as they are."""
+        blob = self._blob(text)
+        return text if blob is None else blob.text
+
+    def digest(self, text):
+        """Return the sha1 of a large text, computed once per distinct text; None for short texts."""
+        blob = self._blob(text)
+        return None if blob is None else blob.digest
+
+    def memo(self, text, kind, version, compute):
+        """Return ``compute(text)``, cached with the text until ``version`` of ``kind`` changes."""
+        blob = self._blob(text)
+        if blob is None:
+            return compute(text)
+        cached = blob.results.get(kind)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+        result = self.intern(compute(text))
+        blob.results[kind] = (version, result)
+        return result
+
+    def clear(self):
+        self._blobs.clear()
+
+
+default_blob_store = BlobStore()
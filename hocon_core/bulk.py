@@ -0,0 +1,83 @@
+"""Edits applied to many agents at once.
+
+Each operation mutates the agents in place and returns the keys of the
+agents it actually changed, so the caller can record them in a single
+revision and rerun once.
+"""
+import re
+
+TEXT_FIELDS = ("instructions", "command")
+
+
+def match_agents(inputs, name_query="", model_name=None):
+    """Return the keys of the agents whose name contains ``name_query``, case-insensitively, and that use ``model_name``.
+
+    ``None`` matches any model.
+    """
+    query = name_query.strip().lower()
+    return [
+        key for key, agent in inputs.items()
+        if query in agent["name"].lower()
+        and (model_name is None or agent["llm_config"].get("model_name") == model_name)
+    ]
+
+
+def set_llm(inputs, keys, model_name=None, temperature=None):
+    """Set the model and/or temperature of ``keys``; ``None`` leaves the setting alone."""
+    changed = []
+    for key in keys:
+        llm_config = inputs[key]["llm_config"]
+        updates = {}
+        if model_name is not None and llm_config.get("model_name") != model_name:
+            updates["model_name"] = model_name
+        if temperature is not None and llm_config.get("temperature") != temperature:
+            updates["temperature"] = temperature
+        if updates:
+            llm_config.update(updates)
+            changed.append(key)
+    return changed
+
+
+def set_function(inputs, function_names, keys, function_name, function_result=None):
+    """Attach the function ``function_name`` to ``keys``, or detach any function when it is None.
+
+    ``function_result`` is the ``{'function': ..., 'class': ...}`` entry
+    built for the function (see ``build_function_result``).
+    """
+    changed = []
+    for key in keys:
+        if function_name is None:
+            function, class_ = {}, ''
+        else:
+            function, class_ = function_result['function'], function_result['class']
+        agent = inputs[key]
+        if function_names.get(key, "") == (function_name or "") and agent["function"] == function and agent["class"] == class_:
+            continue
+        function_names[key] = function_name or ""
+        agent["function"] = function
+        agent["class"] = class_
+        changed.append(key)
+    return changed
+
+
+def replace_text(inputs, keys, find, replace, fields=TEXT_FIELDS, match_case=True):
+    """Replace every occurrence of ``find`` in the text ``fields`` of ``keys``.
+
+    Returns the changed keys and the number of replacements.
+    """
+    if not find:
+        return [], 0
+    pattern = re.compile(re.escape(find), 0 if match_case else re.IGNORECASE)
+    changed, count = [], 0
+    for key in keys:
+        agent = inputs[key]
+        replaced = 0
+        for field in fields:
+            text, n = pattern.subn(lambda _: replace, agent[field])
+            if n:
+                agent[field] = text
+                replaced += n
+        if replaced:
+            changed.append(key)
+            count += replaced
+    return changed, count
@@ -0,0 +1,47 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """Bounded, thread-safe least-recently-used cache.
+
+    Streamlit serves every session from its own thread, so the caches that
+    are shared by the whole process go through a lock. Those module-level
+    caches (``parse_cache``, ``default_fragment_cache``, ``default_substituter``,
+    ``default_blob_store``) are keyed by content alone, which is what makes
+    them safe to share; their values must not be modified.
+    """
+
+    def __init__(self, maxsize=1024):
+        self.maxsize = maxsize
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key not in self._items:
+                return default
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def __contains__(self, key):
+        """Membership counts as a use, so keys that are checked often are not evicted."""
+        with self._lock:
+            if key not in self._items:
+                return False
+            self._items.move_to_end(key)
+            return True
+
+    def __len__(self):
+        return len(self._items)
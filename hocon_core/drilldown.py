@@ -0,0 +1,71 @@
+import functools
+
+AGGREGATE_PREFIX = "__collapsed__:"
+
+
+def aggregate_id(name):
+    return AGGREGATE_PREFIX + name
+
+
+def aggregate_parent(node_id):
+    """Return the agent an aggregate node stands for, or None for a regular node."""
+    if node_id and node_id.startswith(AGGREGATE_PREFIX):
+        return node_id[len(AGGREGATE_PREFIX):]
+    return None
+
+
+@functools.lru_cache(maxsize=64)
+def _spanning_tree(nodes, edges, root):
+    """Breadth-first spanning tree from ``root``: children per node and subtree sizes."""
+    successors = {node: [] for node in nodes}
+    for source, target in edges:
+        if source != target:
+            successors[source].append(target)
+
+    children = {root: []}
+    order = [root]
+    for node in order:  # The list grows while it is being read
+        for child in successors[node]:
+            if child not in children:
+                children[child] = []
+                children[node].append(child)
+                order.append(child)
+
+    subtree_size = {}
+    for node in reversed(order):
+        subtree_size[node] = 1 + sum(subtree_size[child] for child in children[node])
+    return children, subtree_size
+
+
+def drilldown_view(nodes, edges, root, depth, expanded=frozenset()):
+    """Return the part of the network shown when drilling down from ``root``.
+
+    Nodes closer than ``depth`` hops to the root, and nodes in ``expanded``,
+    show their children. The subtree below any other node is collapsed into
+    one aggregate node that carries the number of hidden descendants.
+
+    Returns ``(visible, edges, unreachable)`` where ``visible`` is a list of
+    ``(node_id, label, hidden_count)``; ``hidden_count`` is 0 for agents.
+    """
+    nodes = tuple(nodes)
+    if root not in nodes:
+        return [], [], len(nodes)
+    children, subtree_size = _spanning_tree(nodes, tuple(edges), root)
+
+    visible = []
+    shown = set()
+    frontier = [(root, 0)]
+    for node, level in frontier:  # The list grows while it is being read
+        visible.append((node, node, 0))
+        shown.add(node)
+        if not children[node]:
+            continue
+        if level < depth or node in expanded:
+            frontier.extend((child, level + 1) for child in children[node])
+        else:
+            hidden = subtree_size[node] - 1
+            visible.append((aggregate_id(node), f"+{hidden}", hidden))
+
+    visible_edges = [(source, target) for source, target in edges if source in shown and target in shown]
+    visible_edges += [(node_id[len(AGGREGATE_PREFIX):], node_id) for node_id, _, hidden in visible if hidden]
+    return visible, visible_edges, len(nodes) - len(children)
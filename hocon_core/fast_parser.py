@@ -0,0 +1,159 @@
+"""Single-pass parser for the HOCON subset written by ``HOCONConverter.convert``.
+
+The editor's own exports only use unquoted simple keys, ``key {`` blocks,
+``key = value`` assignments, one list item per line, quoted and triple-quoted
+strings, numbers, booleans and null. Anything else raises
+``UnsupportedHocon`` so the caller can fall back to pyhocon's full grammar.
+"""
+import re
+
+from pyhocon.config_parser import ConfigParser
+from pyhocon.config_tree import ConfigTree
+
+
+class UnsupportedHocon(ValueError):
+    """The text uses HOCON features outside the fast-path subset."""
+
+
+_WHITESPACE = re.compile(r'[ \t\r\n]*')
+_END_OF_LINE = re.compile(r'[ \t]*(?:\n|\Z)')
+_KEY = re.compile(r'([A-Za-z0-9_\-]+)[ \t]*(\{\}|\{|=)[ \t]*')
+_MULTILINE_STRING = re.compile(r'"""(.*?"*)"""', re.DOTALL)
+_QUOTED_STRING = re.compile(r'"((?:[^"\\\n]|\\.)*)"')
+# pyhocon reads a bare value followed by spaces at the very end of the text as a string
+_BARE_END = r'(?=[ \t]*\n|\Z)'
+_NUMBER = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?' + _BARE_END)
+_KEYWORD = re.compile(r'(true|false|null)' + _BARE_END)
+_UNESCAPE = re.compile(r'\\.')
+_KEYWORDS = {'true': True, 'false': False, 'null': None}
+
+
+def _unescape(match):
+    value = match.group(0)
+    return ConfigParser.REPLACEMENTS.get(value, value)  # Same escapes as pyhocon
+
+
+def _convert_number(text):
+    try:
+        return int(text, 10)
+    except ValueError:
+        return float(text)
+
+
+class _Parser:
+    def __init__(self, text):
+        self.text = text.expandtabs()  # pyparsing expands tabs before parsing, so pyhocon does too
+        self.pos = 0
+
+    def fail(self):
+        line = self.text.count('\n', 0, self.pos) + 1
+        raise UnsupportedHocon(f"Unsupported construct on line {line}")
+
+    def skip_whitespace(self):
+        self.pos = _WHITESPACE.match(self.text, self.pos).end()
+
+    def end_of_line(self):
+        match = _END_OF_LINE.match(self.text, self.pos)
+        if match is None:
+            self.fail()
+        self.pos = match.end()
+
+    def parse(self):
+        root = ConfigTree(root=True)
+        self.parse_members(root, closing=None)
+        return root
+
+    def parse_members(self, tree, closing):
+        while True:
+            self.skip_whitespace()
+            if self.pos >= len(self.text):
+                if closing is not None:
+                    self.fail()
+                return
+            if closing is not None and self.text.startswith(closing, self.pos):
+                self.pos += 1
+                self.end_of_line()
+                return
+
+            match = _KEY.match(self.text, self.pos)
+            if match is None:
+                self.fail()
+            key, sign = match.groups()
+            if key in tree:  # Duplicate keys are merged by HOCON
+                self.fail()
+            self.pos = match.end()
+
+            if sign == '{}':
+                tree[key] = ConfigTree()
+                self.end_of_line()
+            elif sign == '{':
+                tree[key] = self.parse_object()
+            else:
+                tree[key] = self.parse_value()
+
+    def parse_object(self):
+        self.end_of_line()
+        tree = ConfigTree()
+        self.parse_members(tree, closing='}')
+        return tree
+
+    def parse_list(self):
+        self.end_of_line()
+        items = []
+        while True:
+            self.skip_whitespace()
+            if self.text.startswith(']', self.pos):
+                self.pos += 1
+                self.end_of_line()
+                return items
+            if self.pos >= len(self.text):
+                self.fail()
+            if self.text.startswith('""', self.pos) and not self.text.startswith('"""', self.pos):
+                self.fail()  # pyhocon drops empty strings from lists
+            if self.text.startswith('null', self.pos):
+                self.fail()  # pyhocon keeps its NoneValue marker in nested lists
+            items.append(self.parse_value())
+
+    def parse_value(self):
+        text, pos = self.text, self.pos
+        if text.startswith('"""', pos):
+            match = _MULTILINE_STRING.match(text, pos)
+            if match is None:
+                self.fail()
+            value = match.group(1)
+        elif text.startswith('"', pos):
+            match = _QUOTED_STRING.match(text, pos)
+            if match is None:
+                self.fail()
+            value = _UNESCAPE.sub(_unescape, match.group(1))
+        elif text.startswith('[]', pos):
+            self.pos += 2
+            self.end_of_line()
+            return []
+        elif text.startswith('[', pos):
+            self.pos += 1
+            return self.parse_list()
+        elif text.startswith('{}', pos):
+            self.pos += 2
+            self.end_of_line()
+            return ConfigTree()
+        elif text.startswith('{', pos):
+            self.pos += 1
+            return self.parse_object()
+        elif (match := _NUMBER.match(text, pos)) is not None:
+            value = _convert_number(match.group(0))
+        elif (match := _KEYWORD.match(text, pos)) is not None:
+            value = _KEYWORDS[match.group(1)]
+        else:
+            self.fail()
+        self.pos = match.end()
+        self.end_of_line()
+        return value
+
+
+def parse_fast(text):
+    """Parse editor-written HOCON into the same ConfigTree shape as pyhocon.
+
+    Raises ``UnsupportedHocon`` as soon as the text leaves the supported subset.
+    """
+    return _Parser(text).parse()
@@ -0,0 +1,65 @@
+import hashlib
+import json
+import re
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def _canonical(obj):
+    """Dump a JSON-like object with sorted keys, so key order does not matter."""
+    return json.dumps(obj, sort_keys=True, ensure_ascii=False, separators=(',', ':'), default=str)
+
+
+def function_fingerprint(spec):
+    """Return an order-independent hash of an agent's ``function`` block."""
+    return hashlib.sha1(_canonical(spec).encode("utf-8")).hexdigest()
+
+
+def _normalized(obj):
+    if isinstance(obj, str):
+        return _WHITESPACE.sub(' ', obj).strip().rstrip('.').lower()
+    if isinstance(obj, dict):
+        return {_normalized(key): _normalized(value) for key, value in obj.items()}
+    if isinstance(obj, list):
+        return [_normalized(item) for item in obj]
+    return obj
+
+
+def function_shape(spec):
+    """Return the fingerprint of a spec with case, whitespace and trailing periods ignored.
+
+    Specs with the same shape but different fingerprints are near-identical.
+    """
+    return function_fingerprint(_normalized(spec))
+
+
+class FunctionIndex:
+    """Dict-backed index of the distinct function blocks found in a network.
+
+    ``add`` is O(1) per spec: identical specs are found by their fingerprint,
+    and specs that only differ from an earlier one in case, whitespace or
+    trailing periods are recorded as candidates to merge.
+    """
+
+    def __init__(self):
+        self.keys_by_fingerprint = {}
+        self.keys_by_shape = {}
+        self.merge_candidates = []  # (earlier key, later key) pairs
+
+    def __len__(self):
+        return len(self.keys_by_fingerprint)
+
+    def add(self, key, spec):
+        """Index ``spec`` under ``key``; return the key of an identical spec added before, or None."""
+        fingerprint = function_fingerprint(spec)
+        first_key = self.keys_by_fingerprint.get(fingerprint)
+        if first_key is not None:
+            return first_key
+        self.keys_by_fingerprint[fingerprint] = key
+
+        shape = function_shape(spec)
+        similar = self.keys_by_shape.setdefault(shape, [])
+        if similar:
+            self.merge_candidates.append((similar[0], key))
+        similar.append(key)
+        return None
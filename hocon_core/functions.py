@@ -0,0 +1,88 @@
+from hocon_core.records import Function, Parameter
+
+
+def new_function():
+    return Function()
+
+
+def new_parameter():
+    return Parameter()
+
+
+def split_class_path(class_path):
+    """Split ``module.Class`` into its module and class parts."""
+    class_list = class_path.split('.')
+    if len(class_list) > 1:
+        return class_list[0], class_list[1]
+    return '', ''
+
+
+def load_function_config(config, functions=None):
+    """Append the function specs of a parsed function file to ``functions``.
+
+    Returns the new functions dictionary; ``functions`` is left untouched.
+    """
+    functions = dict(functions or {})
+    for func_name, func_dict in config.items():
+        new_key = max(functions.keys(), default=-1) + 1
+        func_entry = functions[new_key] = new_function()
+
+        function_data = func_dict.get('function', {})
+        parameters = function_data.get('parameters', {})
+        properties = parameters.get('properties', {})
+
+        func_entry['name'] = func_name
+        func_entry['description'] = function_data.get('description', '')
+        func_entry['module'], func_entry['class'] = split_class_path(func_dict.get('class', ''))
+        func_entry['parameters']['required'] = list(parameters.get('required', []))
+
+        for param_index, (p_name, p_val) in enumerate(properties.items()):
+            func_entry['parameters']['properties'][param_index] = Parameter(
+                p_name, p_val.get('type', ''), p_val.get('description', ''))
+    return functions
+
+
+def build_function_spec(func):
+    """Build the ``function`` block that is attached to an agent."""
+    return {
+        "description": func["description"],
+        "parameters": {
+            "type": func["parameters"]["type"],
+            "properties": {
+                param["name"]: {"type": param["type"], "description": param["description"]}
+                for param in func["parameters"]["properties"].values()
+                if param["name"]  # Ensuring 'name' is not empty
+            } if func["parameters"]["properties"] else {},  # Allow empty 'properties'
+            "required": func["parameters"].get("required", [])
+        },
+    }
+
+
+def build_function_result(func):
+    """Build the library entry of one function: its spec and ``module.Class`` path."""
+    return {
+        'function': build_function_spec(func),
+        'class': "" if not func["module"] and not func["class"] else f"{func['module']}.{func['class']}"
+    }
+
+
+def build_function_results(functions):
+    """Build the exported function library, keyed by function name."""
+    return {v['name']: build_function_result(v) for v in functions.values() if v['name']}
+
+
+def validate_functions(functions):
+    """Return an error message per function key; empty string when valid."""
+    errors = {}
+    seen_pairs = set()
+    seen_names = set()
+    for key, func in functions.items():
+        errors[key] = ''
+        pair = (func['module'], func['class'])
+        if func['name'] and func['name'] in seen_names:
+            errors[key] = f"❌ '{func['name']}' is already in used. Choose a different name."
+        elif any(pair) and pair in seen_pairs:
+            errors[key] = f"❌ '{func['module']}.{func['class']}' is already used. Choose a different module or class."
+        seen_names.add(func['name'])
+        seen_pairs.add(pair)
+    return errors
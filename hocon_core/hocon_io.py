@@ -0,0 +1,45 @@
+import hashlib
+
+from pyhocon import ConfigFactory
+
+from hocon_core.cache import LRUCache
+from hocon_core.fast_parser import UnsupportedHocon, parse_fast
+from hocon_core.writers import write_text
+
+SUPPORTED_EXTENSIONS = ('.hocon', '.conf', '.json')
+
+# SHA-256 of the raw bytes -> parsed config
+parse_cache = LRUCache(maxsize=64)
+
+
+def parse_hocon(text):
+    """Parse HOCON text into a ConfigTree.
+
+    Files written by the editor take the single-pass fast path; anything
+    outside that subset goes through pyhocon's full parser.
+    """
+    try:
+        return parse_fast(text)
+    except UnsupportedHocon:
+        return ConfigFactory.parse_string(text)
+
+
+def parse_file_bytes(file_name, data):
+    """Parse the raw bytes of an uploaded or on-disk HOCON file.
+
+    Identical files are only parsed once; the returned config is shared and
+    must not be modified.
+    """
+    if not file_name.endswith(SUPPORTED_EXTENSIONS):
+        raise ValueError("Unsupported file format!")
+    digest = hashlib.sha256(data).hexdigest()
+    config = parse_cache.get(digest)
+    if config is None:
+        config = parse_hocon(data.decode("utf-8"))
+        parse_cache.put(digest, config)
+    return config
+
+
+def to_hocon(data):
+    """Convert a plain dictionary to a HOCON string, exactly as pyhocon's converter would."""
+    return write_text(data, "hocon")
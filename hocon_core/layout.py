@@ -0,0 +1,187 @@
+import functools
+import math
+
+LAYOUTS = ('layered', 'force')
+
+
+def network_topology(inputs):
+    """Return the named agents and the edges between them, in key order."""
+    nodes = tuple(agent['name'] for agent in inputs.values() if agent['name'])
+    names = set(nodes)
+    edges = tuple(
+        (agent['name'], conn)
+        for agent in inputs.values() if agent['name']
+        for conn in agent['tools'] if conn in names
+    )
+    return nodes, edges
+
+
+def _acyclic_edges(nodes, edges):
+    """Reverse the back edges found by a depth-first search started from the nodes in order.
+
+    Edges into the first node are reversed as well, so it has no parent.
+    """
+    successors = {node: [] for node in nodes}
+    for source, target in edges:
+        if source != target:
+            successors[source].append(target)
+
+    state = {}  # node -> 1 while on the stack, 2 when done
+    back_edges = set()
+    for root in nodes:
+        if root in state:
+            continue
+        state[root] = 1
+        stack = [(root, iter(successors[root]))]
+        while stack:
+            node, children = stack[-1]
+            child = next(children, None)
+            if child is None:
+                state[node] = 2
+                stack.pop()
+            elif child not in state:
+                state[child] = 1
+                stack.append((child, iter(successors[child])))
+            elif state[child] == 1:
+                back_edges.add((node, child))
+
+    root = nodes[0]
+    return [
+        (target, source) if (source, target) in back_edges or target == root else (source, target)
+        for source, target in edges if source != target
+    ]
+
+
+def layered_layout(nodes, edges, layer_gap=150, node_gap=110, sweeps=4):
+    """Sugiyama-style layout: break cycles, assign layers, reduce crossings, place nodes.
+
+    The first node (the frontman) is a root of the search, so it ends up in
+    the top layer. Crossings are reduced with barycenter sweeps between
+    adjacent layers.
+    """
+    if not nodes:
+        return {}
+    dag = _acyclic_edges(nodes, edges)
+    successors = {node: [] for node in nodes}
+    predecessors = {node: [] for node in nodes}
+    for source, target in dag:
+        successors[source].append(target)
+        predecessors[target].append(source)
+
+    # Longest-path layering in topological order
+    in_degree = {node: len(predecessors[node]) for node in nodes}
+    layer = {node: 0 for node in nodes}
+    queue = [node for node in nodes if in_degree[node] == 0]
+    for node in queue:  # The queue grows while it is being read
+        for child in successors[node]:
+            layer[child] = max(layer[child], layer[node] + 1)
+            in_degree[child] -= 1
+            if in_degree[child] == 0:
+                queue.append(child)
+
+    layers = [[] for _ in range(max(layer.values()) + 1)]
+    for node in nodes:
+        layers[layer[node]].append(node)
+
+    position = {node: i for nodes_in_layer in layers for i, node in enumerate(nodes_in_layer)}
+
+    def reorder(current, neighbours):
+        def barycenter(node):
+            linked = [position[other] for other in neighbours[node]]
+            return sum(linked) / len(linked) if linked else position[node]
+        current.sort(key=barycenter)
+        for i, node in enumerate(current):
+            position[node] = i
+
+    for _ in range(sweeps):
+        for current in layers[1:]:
+            reorder(current, predecessors)
+        for current in reversed(layers[:-1]):
+            reorder(current, successors)
+
+    coordinates = {}
+    for depth, nodes_in_layer in enumerate(layers):
+        offset = (len(nodes_in_layer) - 1) / 2
+        for i, node in enumerate(nodes_in_layer):
+            coordinates[node] = (round((i - offset) * node_gap), depth * layer_gap)
+    return coordinates
+
+
+def force_layout(nodes, edges, spacing=100, iterations=50):
+    """Fruchterman-Reingold layout with grid-based repulsion.
+
+    Nodes start on a golden-angle spiral, so the result is deterministic.
+    Repulsion is only computed between nodes in neighbouring grid cells,
+    which keeps each iteration close to linear in the number of nodes.
+    """
+    if not nodes:
+        return {}
+    golden_angle = math.pi * (3 - math.sqrt(5))
+    x = [spacing * math.sqrt(i) * math.cos(i * golden_angle) for i in range(len(nodes))]
+    y = [spacing * math.sqrt(i) * math.sin(i * golden_angle) for i in range(len(nodes))]
+    index = {node: i for i, node in enumerate(nodes)}
+    links = [(index[source], index[target]) for source, target in edges if source != target]
+
+    k = spacing
+    cell = 2 * k
+    temperature = spacing * math.sqrt(len(nodes))
+    cooling = temperature / (iterations + 1)
+
+    for _ in range(iterations):
+        dx = [0.0] * len(nodes)
+        dy = [0.0] * len(nodes)
+
+        grid = {}
+        for i in range(len(nodes)):
+            grid.setdefault((int(x[i] // cell), int(y[i] // cell)), []).append(i)
+        for (cx, cy), members in grid.items():
+            neighbours = [j for ox in (-1, 0, 1) for oy in (-1, 0, 1) for j in grid.get((cx + ox, cy + oy), ())]
+            for i in members:
+                for j in neighbours:
+                    if i == j:
+                        continue
+                    ddx = x[i] - x[j]
+                    ddy = y[i] - y[j]
+                    distance = math.hypot(ddx, ddy) or 0.01
+                    if distance < cell:
+                        force = k * k / distance
+                        dx[i] += ddx / distance * force
+                        dy[i] += ddy / distance * force
+
+        for i, j in links:
+            ddx = x[i] - x[j]
+            ddy = y[i] - y[j]
+            distance = math.hypot(ddx, ddy) or 0.01
+            force = distance * distance / k
+            dx[i] -= ddx / distance * force
+            dy[i] -= ddy / distance * force
+            dx[j] += ddx / distance * force
+            dy[j] += ddy / distance * force
+
+        for i in range(len(nodes)):
+            displacement = math.hypot(dx[i], dy[i])
+            if displacement > 0:
+                step = min(displacement, temperature)
+                x[i] += dx[i] / displacement * step
+                y[i] += dy[i] / displacement * step
+        temperature -= cooling
+
+    return {node: (round(x[i]), round(y[i])) for node, i in index.items()}
+
+
+@functools.lru_cache(maxsize=64)
+def _cached_layout(mode, nodes, edges):
+    if mode == 'layered':
+        return layered_layout(nodes, edges)
+    return force_layout(nodes, edges)
+
+
+def compute_layout(nodes, edges, mode='layered'):
+    """Return ``{node: (x, y)}``, computed once per topology and layout mode.
+
+    The cache is shared by every session, so edits that do not change the
+    agent names or connections never lay the graph out again.
+    """
+    if mode not in LAYOUTS:
+        raise ValueError(f"Unknown layout {mode!r}; expected one of {', '.join(LAYOUTS)}")
+    return _cached_layout(mode, tuple(nodes), tuple(edges))
@@ -0,0 +1,39 @@
+from types import MappingProxyType
+
+LLM_MODEL_DICT = MappingProxyType({
+    "gpt-4.5-preview": "gpt-4.5-preview-2025-02-27",
+    "gpt-4o": "gpt-4o-2024-08-06",
+    "gpt-4o-mini": "gpt-4o-mini-2024-07-18",
+    "o1": "o1-2024-12-17",
+    "o1-mini": "o1-mini-2024-09-12",
+    "o3-mini": "o3-mini-2025-01-31",
+    "o1-preview": "o1-preview-2024-09-12",
+    "Claude 3.7 Sonnet": "claude-3-7-sonnet-20250219",
+    "Claude 3.5 Haiku": "claude-3-5-haiku-20241022",
+    "Claude 3.5 Sonnet v2": "claude-3-5-sonnet-20241022",
+    "Claude 3.5 Sonnet": "claude-3-5-sonnet-20240620",
+    "Claude 3 Opus": "claude-3-opus-20240229",
+    "Claude 3 Sonnet": "claude-3-sonnet-20240229",
+    "Claude 3 Haiku": "claude-3-haiku-20240307"
+})
+LLM_MODEL_NAMES = tuple(LLM_MODEL_DICT)  # Options of the model selectboxes
+
+DEFAULT_LLM_MODEL = next(iter(LLM_MODEL_DICT))
+DEFAULT_TEMPERATURE = 0.5
+
+
+def get_key(d, value):
+    return next((k for k, v in d.items() if v == value))
+
+
+def get_value(d, key):
+    # Step 1: If the key exists in the dictionary, return its value
+    if key in d:
+        return key
+
+    # Step 2: If the key doesn't exist, check if it's in the values
+    if key in d.values():
+        return get_key(d, key)
+
+    # Step 3: If nothing matches, return the first value in the dictionary
+    return next(iter(d.keys()))
@@ -0,0 +1,136 @@
+from hocon_core.blobs import default_blob_store
+from hocon_core.function_index import FunctionIndex
+from hocon_core.functions import build_function_spec, new_function, split_class_path
+from hocon_core.llm import DEFAULT_LLM_MODEL, DEFAULT_TEMPERATURE, LLM_MODEL_DICT, get_value
+from hocon_core.records import Agent, Parameter
+from hocon_core.substitution import get_reverse_substituter, remove_empty_values, replace_strings_in_nested_dict
+
+
+def new_agent(llm_model=DEFAULT_LLM_MODEL, temperature=DEFAULT_TEMPERATURE):
+    return Agent(llm_config={"model_name": llm_model, "temperature": temperature})
+
+
+def new_network_state():
+    """Return the editor state of an empty network with only a frontman."""
+    return {
+        "llm_model": DEFAULT_LLM_MODEL,
+        "temperature": DEFAULT_TEMPERATURE,
+        "inputs": {0: new_agent()},  # Store name, instructions, command, and tools per node
+        "function_names": {0: ""},
+    }
+
+
+def load_network_config(config, sub_dict=None, functions=None):
+    """Convert a parsed network config into editor state.
+
+    Values found in ``sub_dict`` are turned back into ``${key}`` references.
+    Functions attached to agents are appended to a copy of ``functions``; the
+    number of parameters of each new function is returned in ``add_func_param``.
+    Identical function blocks are shared; pairs of function names whose blocks
+    only differ in case or whitespace are returned in ``merge_candidates``.
+    """
+    substituter = get_reverse_substituter(sub_dict or {})  # Compiled once for every string of the network
+
+    def reverse(text):
+        # Texts shared by many agents are only scanned once
+        return default_blob_store.memo(text, "reverse", substituter, substituter)
+
+    state = new_network_state()
+    state["functions"] = dict(functions or {})
+    state["add_func_param"] = {}
+    function_index = FunctionIndex()
+    next_func_index = max(state["functions"], default=-1) + 1
+
+    default_llm_model = state["llm_model"]
+    default_llm_config = config.get('llm_config', {})
+    if default_llm_config:
+        default_llm_model = default_llm_config.get('model_name', DEFAULT_LLM_MODEL)
+        state["llm_model"] = get_value(LLM_MODEL_DICT, default_llm_model)
+        state["temperature"] = default_llm_config.get('temperature', DEFAULT_TEMPERATURE)
+
+    inputs = state["inputs"]
+    function_names = state["function_names"]
+    functions = state["functions"]
+
+    network = config.get('tools', [])
+    if network and isinstance(network, list):
+        for agent_index, agent in enumerate(network):
+            agent_entry = inputs.setdefault(agent_index, new_agent(state["llm_model"], state["temperature"]))
+            agent_entry['name'] = reverse(agent.get('name', ''))
+            module_class = agent.get('class', '')
+            agent_entry['class'] = reverse(module_class)
+            agent_entry['instructions'] = reverse(agent.get('instructions', ''))
+            agent_entry['command'] = reverse(agent.get('command', ''))
+            agent_entry['tools'] = [reverse(tool) for tool in agent.get('tools', [])]  # Written like the names they point to
+            llm_config = agent.get('llm_config', {'model_name': state["llm_model"], 'temperature': state["temperature"]})
+            llm_model = llm_config.get('model_name', default_llm_model)
+            agent_entry['llm_config']['model_name'] = get_value(LLM_MODEL_DICT, llm_model)
+            agent_entry['llm_config']['temperature'] = llm_config.get('temperature', state["temperature"])
+
+            func = agent.get('function', {})
+            if func and isinstance(func, dict):
+                first_index = function_index.add(agent_index, func)
+                if first_index is None:
+                    func_index = next_func_index
+                    next_func_index += 1
+                    func_entry = functions.setdefault(func_index, new_function())
+                    func_entry['name'] = f'func_{func_index}'
+                    function_names[agent_index] = func_entry['name']
+                    func_entry['description'] = reverse(func.get('description', ''))
+                    if module_class:
+                        module_name, class_name = split_class_path(module_class)
+                        func_entry['module'] = reverse(module_name)
+                        func_entry['class'] = reverse(class_name)
+                    parameters = func.get('parameters', {})
+                    func_entry['parameters']['required'] = list(parameters.get('required', []))
+                    properties = parameters.get('properties', {})
+                    state["add_func_param"][func_entry['name']] = len(properties)
+                    for param_index, (p_name, p_val) in enumerate(properties.items()):
+                        func_entry['parameters']['properties'][param_index] = Parameter(
+                            reverse(p_name), p_val.get('type', ''), reverse(p_val.get('description', '')))
+                    agent_entry['function'] = build_function_spec(func_entry)
+                else:
+                    function_names[agent_index] = function_names[first_index]
+                    agent_entry['function'] = inputs[first_index]['function']
+            else:
+                function_names[agent_index] = ''
+
+    state["merge_candidates"] = [
+        (function_names[first], function_names[second]) for first, second in function_index.merge_candidates
+    ]
+    return state
+
+
+def build_network_data(inputs, llm_model, temperature, sub_dict=None):
+    """Build the exported network dictionary from the agents in ``inputs``."""
+    new_tools = replace_strings_in_nested_dict(inputs, sub_dict or {})
+
+    data = {
+        "llm_config": {
+            "model_name": llm_model,
+            "temperature": temperature,
+        },
+        "tools": [i for i in new_tools.values() if i['name'] != '']
+    }
+
+    return remove_empty_values(data)
+
+
+def validate_network(inputs):
+    """Return an error message per agent key; empty string when valid."""
+    errors = {}
+    existing_names = set()
+    all_names = {agent['name'] for agent in inputs.values() if agent['name']}
+    for key, agent in inputs.items():
+        errors[key] = ''
+        name = agent['name']
+        if name and name in existing_names:
+            errors[key] = f"❌ '{name}' is already in used. Choose a different name."
+        elif key == 0 and not name:
+            errors[key] = "❌ The frontman must have a name."
+        else:
+            unknown = [conn for conn in agent['tools'] if conn not in all_names or conn == name]
+            if unknown:
+                errors[key] = f"❌ '{name}' points to unknown agents: {', '.join(unknown)}."
+        existing_names.add(name)
+    return errors
@@ -0,0 +1,18 @@
+def page_count(total, page_size):
+    """Number of pages needed for ``total`` items; at least one."""
+    return max(1, -(-total // page_size))
+
+
+def clamp_page(page, total, page_size):
+    return min(max(page, 0), page_count(total, page_size) - 1)
+
+
+def page_slice(keys, page, page_size):
+    """Return the keys shown on ``page`` (0-based)."""
+    page = clamp_page(page, len(keys), page_size)
+    return keys[page * page_size:(page + 1) * page_size]
+
+
+def page_of(keys, key, page_size):
+    """Return the page (0-based) on which ``key`` is shown."""
+    return keys.index(key) // page_size
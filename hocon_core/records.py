@@ -0,0 +1,139 @@
+from collections.abc import MutableMapping
+
+from hocon_core.blobs import default_blob_store
+
+intern = default_blob_store.intern  # Shared texts are stored once
+
+
+class Record(MutableMapping):
+    """Compact, ``__slots__``-based record that behaves like a dict with a fixed set of keys.
+
+    Subclasses list their fields in ``__slots__``, in export order; a trailing
+    underscore maps a slot to a reserved word (``class_`` is the ``class`` key).
+    Editor code keeps using ``record['name']``, while each record takes a
+    fraction of the memory of the equivalent dict.
+    """
+
+    __slots__ = ()
+    KEYS = ()
+    _ATTRS = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.KEYS = tuple(slot.rstrip('_') for slot in cls.__slots__)
+        cls._ATTRS = dict(zip(cls.KEYS, cls.__slots__))
+
+    def __getitem__(self, key):
+        try:
+            return getattr(self, self._ATTRS[key])
+        except KeyError:
+            raise KeyError(key) from None
+
+    def __setitem__(self, key, value):
+        try:
+            setattr(self, self._ATTRS[key], intern(value))
+        except KeyError:
+            raise KeyError(f"{type(self).__name__} has no field {key!r}") from None
+
+    def __delitem__(self, key):
+        raise TypeError(f"Fields of {type(self).__name__} cannot be deleted")
+
+    def __iter__(self):
+        return iter(self.KEYS)
+
+    def __len__(self):
+        return len(self.KEYS)
+
+    def __contains__(self, key):
+        return key in self._ATTRS
+
+    def __eq__(self, other):
+        if isinstance(other, Record):
+            return type(self) is type(other) and all(self[key] == other[key] for key in self.KEYS)
+        return isinstance(other, dict) and self.to_dict() == other
+
+    __hash__ = None
+
+    def __repr__(self):
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+    def __getstate__(self):
+        return tuple(getattr(self, slot) for slot in self.__slots__)
+
+    def __setstate__(self, state):
+        for slot, value in zip(self.__slots__, state):
+            setattr(self, slot, value)
+
+    def to_dict(self):
+        """Return a plain dict, converting nested records as well."""
+        return {key: _plain(getattr(self, slot)) for key, slot in self._ATTRS.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        record = cls()
+        for key, value in data.items():
+            record[key] = value
+        return record
+
+
+def _plain(value):
+    if isinstance(value, Record):
+        return value.to_dict()
+    if isinstance(value, dict):
+        return {key: _plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain(item) for item in value]
+    return value
+
+
+class Agent(Record):
+    __slots__ = ('name', 'class_', 'function', 'instructions', 'command', 'tools', 'llm_config')
+
+    def __init__(self, name="", class_="", function=None, instructions="", command="", tools=None, llm_config=None):
+        self.name = name
+        self.class_ = class_
+        self.function = {} if function is None else function
+        self.instructions = intern(instructions)
+        self.command = intern(command)
+        self.tools = [] if tools is None else tools
+        self.llm_config = {} if llm_config is None else llm_config
+
+
+class Parameter(Record):
+    __slots__ = ('name', 'type', 'description')
+
+    def __init__(self, name="", type="", description=""):
+        self.name = name
+        self.type = type
+        self.description = intern(description)
+
+
+class Function(Record):
+    __slots__ = ('name', 'description', 'parameters', 'module', 'class_')
+
+    def __init__(self, name="", description="", parameters=None, module="", class_=""):
+        self.name = name
+        self.description = intern(description)
+        self.parameters = {"type": "object", "properties": {}, "required": []} if parameters is None else parameters
+        self.module = module
+        self.class_ = class_
+
+    @classmethod
+    def from_dict(cls, data):
+        record = super().from_dict(data)
+        properties = record.parameters.get("properties", {})
+        record.parameters = dict(record.parameters, properties={
+            # Keys come back from JSON as strings; the editor numbers parameters with ints
+            int(key) if isinstance(key, str) and key.isdigit() else key:
+                param if isinstance(param, Parameter) else Parameter.from_dict(param)
+            for key, param in properties.items()
+        })
+        return record
+
+
+class Var(Record):
+    __slots__ = ('var', 'sub_value')
+
+    def __init__(self, var="", sub_value=""):
+        self.var = var
+        self.sub_value = intern(sub_value)
@@ -0,0 +1,77 @@
+class RevisionStore:
+    """Revision counters for the editor state, and views derived from it.
+
+    Every change to an entity (an agent, a function, a variable) bumps the
+    revision of the entity and of its kind; replacing a whole collection
+    bumps the kind alone, which invalidates all of its entities. Derived
+    views remember the revisions they were computed from and are only
+    recomputed after one of them changed.
+    """
+
+    def __init__(self):
+        self._clock = 0
+        self._kinds = {}  # kind -> latest revision of any of its entities
+        self._resets = {}  # kind -> revision of the last bulk change
+        self._entities = {}  # (kind, key) -> revision
+        self._views = {}  # name -> (stamp, value)
+        self._each = {}  # name -> {key: (revision, value)}
+        self.on_touch = None  # Called with (kind, keys) after every change, e.g. to autosave it
+
+    def _tick(self):
+        self._clock += 1
+        return self._clock
+
+    def touch(self, kind, *keys):
+        """Record a change to the entities ``keys`` of ``kind``; without keys the whole kind changed."""
+        revision = self._kinds[kind] = self._tick()
+        if not keys:
+            self._resets[kind] = revision
+            self._entities = {entity: rev for entity, rev in self._entities.items() if entity[0] != kind}
+        for key in keys:
+            self._entities[(kind, key)] = revision
+        if self.on_touch is not None:
+            self.on_touch(kind, keys)
+
+    def revision(self, *kinds):
+        return tuple(self._kinds.get(kind, 0) for kind in kinds)
+
+    def entity_revision(self, kind, key):
+        return max(self._entities.get((kind, key), 0), self._resets.get(kind, 0))
+
+    def derive(self, name, kinds, compute):
+        """Return the view ``name``, calling ``compute()`` only if ``kinds`` changed since the last call."""
+        stamp = self.revision(*kinds)
+        cached = self._views.get(name)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        value = compute()
+        self._views[name] = (stamp, value)
+        return value
+
+    def peek(self, name, kinds):
+        """Return the view ``name`` if it is up to date with ``kinds``, else None; never computes it."""
+        cached = self._views.get(name)
+        if cached is not None and cached[0] == self.revision(*kinds):
+            return cached[1]
+        return None
+
+    def discard(self, name):
+        self._views.pop(name, None)
+
+    def compact(self):
+        """Drop every derived view; they are rebuilt on demand."""
+        self._views = {}
+        self._each = {}
+
+    def derive_each(self, name, kind, items, compute):
+        """Map ``compute(key, value)`` over ``items``, reusing the result of every unchanged entity."""
+        cache = self._each.get(name, {})
+        fresh = {}
+        for key, value in items.items():
+            stamp = self.entity_revision(kind, key)
+            cached = cache.get(key)
+            if cached is None or cached[0] != stamp:
+                cached = (stamp, compute(key, value))
+            fresh[key] = cached
+        self._each[name] = fresh  # Entities that no longer exist are dropped
+        return {key: value for key, (_, value) in fresh.items()}
@@ -0,0 +1,160 @@
+import re
+
+TOKEN = re.compile(r"\w+")
+KINDS = ("agents", "functions", "vars")  # Order of the results
+
+
+def trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+def agent_documents(agent):
+    return {"name": agent["name"], "instructions": agent["instructions"], "command": agent["command"]}
+
+
+def function_documents(func):
+    params = func["parameters"].get("properties", {}).values()
+    return {"name": func["name"], "description": func["description"],
+            "parameters": " ".join(param["name"] for param in params)}
+
+
+def var_documents(var):
+    return {"name": var["var"], "value": str(var["sub_value"])}
+
+
+DOCUMENTS = {"agents": agent_documents, "functions": function_documents, "vars": var_documents}
+FIELDS = {"agents": ("name", "instructions", "command"), "functions": ("name", "description", "parameters"),
+          "vars": ("name", "value")}
+
+
+class SearchIndex:
+    """Inverted index over the text fields of agents, functions and variables.
+
+    A document is one field of one entity, ``(kind, key, field)``. Every
+    document is indexed by its trigrams, which narrow a substring query down
+    to a few candidates, and by its word tokens, which answer words shorter
+    than a trigram (those only match inside a word); short terms made of
+    punctuation, such as ``$``, scan the texts. ``sync`` re-indexes only the
+    entities whose revision changed since the last call.
+    """
+
+    def __init__(self):
+        self._texts = {}  # document -> lowercased text
+        self._originals = {}  # document -> text as entered, for snippets
+        self._order = {}  # document -> sort key of the results: names first, then by kind and key
+        self._ranking = None  # Documents in result order and their positions; rebuilt after a change
+        self._grams = {}  # trigram -> documents
+        self._tokens = {}  # token -> documents
+        self._stamps = {}  # kind -> {key: revision indexed}
+        self._kind_revisions = {}
+
+    def __len__(self):
+        return len(self._texts)
+
+    def set(self, document, text):
+        if self._originals.get(document) == text:
+            return
+        self.remove(document)
+        if not text:
+            return
+        self._originals[document] = text
+        self._ranking = None
+        kind, key, field = document
+        self._order[document] = (field != "name", KINDS.index(kind), key, field)
+        text = self._texts[document] = text.lower()
+        for gram in trigrams(text):
+            self._grams.setdefault(gram, set()).add(document)
+        for token in set(TOKEN.findall(text)):
+            self._tokens.setdefault(token, set()).add(document)
+
+    def remove(self, document):
+        text = self._texts.pop(document, None)
+        if text is None:
+            return
+        del self._originals[document]
+        del self._order[document]
+        self._ranking = None
+        for index, terms in ((self._grams, trigrams(text)), (self._tokens, set(TOKEN.findall(text)))):
+            for term in terms:
+                documents = index[term]
+                documents.discard(document)
+                if not documents:
+                    del index[term]
+
+    def sync(self, revisions, kind, items):
+        """Bring the documents of ``kind`` up to date with ``items``, using the revisions of ``revisions``."""
+        revision = revisions.revision(kind)
+        if self._kind_revisions.get(kind) == revision:
+            return
+        stamps = self._stamps.setdefault(kind, {})
+        documents = DOCUMENTS[kind]
+        for key in set(stamps) - set(items):
+            for field in FIELDS[kind]:
+                self.remove((kind, key, field))
+            del stamps[key]
+        for key, item in items.items():
+            stamp = revisions.entity_revision(kind, key)
+            if stamps.get(key) != stamp:
+                for field, text in documents(item).items():
+                    self.set((kind, key, field), text)
+                stamps[key] = stamp
+        self._kind_revisions[kind] = revision
+
+    def _ranked(self):
+        if self._ranking is None:
+            ranked = sorted(self._order, key=self._order.__getitem__)
+            self._ranking = ranked, {document: position for position, document in enumerate(ranked)}
+        return self._ranking
+
+    def _candidates(self, term):
+        if len(term) >= 3:
+            postings = sorted((self._grams.get(gram, set()) for gram in trigrams(term)), key=len)
+            return set.intersection(*postings) if postings[0] else set()
+        if TOKEN.fullmatch(term):  # Shorter than a trigram: look through the vocabulary instead of the texts
+            return set().union(*(documents for token, documents in self._tokens.items() if term in token))
+        # Punctuation such as "$" is in no token
+        return {document for document, text in self._texts.items() if term in text}
+
+    def search(self, query, limit=50):
+        """Return up to ``limit`` documents containing every word of ``query``, case-insensitively.
+
+        Documents in which the words appear as one phrase come first; within
+        that, names come before other fields.
+        """
+        query = " ".join(query.lower().split())
+        if not query:
+            return []
+        words = query.split(" ")
+        candidates = None
+        for word in sorted(words, key=len, reverse=True):  # Longest words have the shortest postings
+            found = self._candidates(word)
+            candidates = found if candidates is None else candidates & found
+            if not candidates:
+                return []
+        # Walk the candidates in result order and stop once ``limit`` phrase matches were found
+        ranked, position = self._ranked()
+        if len(candidates) * 8 > len(ranked):  # Common words: filtering the ranking beats sorting the candidates
+            ordered = (document for document in ranked if document in candidates)
+        else:
+            ordered = sorted(candidates, key=position.__getitem__)
+        phrase_matches, other_matches = [], []
+        for document in ordered:
+            text = self._texts[document]
+            if query in text:
+                phrase_matches.append(document)
+                if len(phrase_matches) == limit:
+                    break
+            elif len(other_matches) < limit and all(word in text for word in words):
+                other_matches.append(document)
+        return (phrase_matches + other_matches)[:limit]
+
+    def snippet(self, document, query, width=60):
+        """Return the text around the first match of ``query`` in ``document``."""
+        text, original = self._texts.get(document, ""), self._originals.get(document, "")
+        words = query.lower().split()
+        start = text.find(" ".join(words)) if words else -1
+        if start < 0 and words:
+            start = text.find(words[0])
+        start = max(start - width // 3, 0)
+        original = " ".join(original[start:start + width].split())  # Lowercasing keeps the offsets of most texts
+        return ("…" if start else "") + original + ("…" if start + width < len(text) else "")
@@ -0,0 +1,80 @@
+import hashlib
+import json
+
+from hocon_core.blobs import default_blob_store
+from hocon_core.cache import LRUCache
+from hocon_core.hocon_io import to_hocon
+from hocon_core.network import build_network_data
+from hocon_core.records import Record
+from hocon_core.substitution import remove_empty_values, replace_strings_in_nested_dict, sub_dict_version
+from hocon_core.writers import WRITERS, hocon_value
+
+AGENT_LEVEL = 2  # Agents are items of the root "tools" list
+AGENT_INDENT = '  '
+
+
+def _json_default(obj):
+    return obj.to_dict() if isinstance(obj, Record) else str(obj)
+
+
+def _addressed(value):
+    # Large texts stand in by the digest kept in the blob store, so they are not dumped and hashed again
+    if isinstance(value, str):
+        digest = default_blob_store.digest(value)
+        return value if digest is None else f"\0blob:{digest}"
+    if isinstance(value, (dict, Record)):
+        return {key: _addressed(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_addressed(item) for item in value]
+    return value
+
+
+def content_hash(obj):
+    """Return a stable hash of a JSON-like object, preserving key order."""
+    dumped = json.dumps(_addressed(obj), ensure_ascii=False, default=_json_default)
+    return hashlib.sha1(dumped.encode("utf-8")).hexdigest()
+
+
+# content_hash of an agent -> its HOCON fragment
+default_fragment_cache = LRUCache(maxsize=8192)
+
+
+def serialize_agent(agent, sub_dict, version=None):
+    """Substitute, clean and serialize one agent as an item of the "tools" list."""
+    cleaned = remove_empty_values(replace_strings_in_nested_dict(agent, sub_dict, version))
+    return AGENT_INDENT + hocon_value(cleaned, level=AGENT_LEVEL)
+
+
+def serialize_network(inputs, llm_model, temperature, sub_dict=None, cache=None):
+    """Serialize the network to HOCON, re-serializing only agents that changed.
+
+    The result is identical to ``to_hocon(build_network_data(...))``; each
+    agent's fragment is looked up by the hash of its content and of the
+    substitution table, and the fragments are stitched into the document.
+    """
+    sub_dict = sub_dict or {}
+    cache = default_fragment_cache if cache is None else cache
+    version = sub_dict_version(sub_dict)
+
+    fragments = []
+    for agent in inputs.values():
+        if agent['name'] == '':
+            continue
+        key = f"{version}:{content_hash(agent)}"
+        fragment = cache.get(key)
+        if fragment is None:
+            fragment = serialize_agent(agent, sub_dict, version)
+            cache.put(key, fragment)
+        fragments.append(fragment)
+
+    hocon_str = to_hocon(remove_empty_values({"llm_config": {"model_name": llm_model, "temperature": temperature}}))
+    if fragments:
+        hocon_str += '\ntools = [\n' + '\n'.join(fragments) + '\n]'
+    return hocon_str
+
+
+def network_text(inputs, llm_model, temperature, sub_dict=None, output_format="hocon"):
+    """Export the network in ``output_format``; HOCON goes through the per-agent fragment cache."""
+    if output_format == "hocon":
+        return serialize_network(inputs, llm_model, temperature, sub_dict)
+    return ''.join(WRITERS[output_format](build_network_data(inputs, llm_model, temperature, sub_dict)))
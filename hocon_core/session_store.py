@@ -0,0 +1,142 @@
+import json
+import logging
+import queue
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+FLUSH = object()  # Queued by ``flush``: write the pending batch now
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS changes (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    key TEXT,       -- NULL: the payload replaces the whole kind
+    payload TEXT    -- NULL: the entity was deleted
+);
+CREATE INDEX IF NOT EXISTS changes_by_session ON changes (session, id);
+"""
+
+
+def fold_changes(rows):
+    """Replay ``(kind, key, payload)`` rows into ``{kind: value}``.
+
+    A row without key replaces the kind with its payload; other rows set or,
+    with a NULL payload, delete one entity of a dict-valued kind.
+    """
+    state = {}
+    for kind, key, payload in rows:
+        if key is None:
+            state[kind] = json.loads(payload)
+        elif payload is None:
+            state.get(kind, {}).pop(key, None)
+        else:
+            state.setdefault(kind, {})[key] = json.loads(payload)
+    return state
+
+
+class SessionStore:
+    """Append-only log of editor changes in a SQLite database in WAL mode.
+
+    ``record`` only queues a change; a background thread waits ``debounce``
+    seconds for more, keeps the last change of each entity and writes the
+    batch in one transaction. A batch is written at the latest ``max_delay``
+    seconds after its first change or once it holds ``max_batch`` changes,
+    and at once when ``flush`` is called. A session whose log grows past
+    ``compact_after`` rows is folded into one row per kind.
+    """
+
+    def __init__(self, path, debounce=1.0, compact_after=2000, max_delay=5.0, max_batch=1000):
+        self.path = path
+        self.debounce = debounce
+        self.compact_after = compact_after
+        self.max_delay = max_delay
+        self.max_batch = max_batch
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run, name="hocon-autosave", daemon=True)
+        with self._connect() as connection:
+            connection.executescript(SCHEMA)
+        self._writer.start()
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path, timeout=30)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        return connection
+
+    def record(self, session, kind, key=None, payload=None):
+        """Queue a change; ``payload`` is JSON-serializable, or None to delete the entity ``key``."""
+        text = None if payload is None else json.dumps(payload, ensure_ascii=False)
+        self._queue.put((session, kind, None if key is None else str(key), text))
+
+    def load(self, session):
+        """Return the folded state of ``session``; empty if nothing was saved."""
+        self.flush()
+        with self._connect() as connection:
+            rows = connection.execute(
+                "SELECT kind, key, payload FROM changes WHERE session = ? ORDER BY id", (session,)).fetchall()
+        return fold_changes(rows)
+
+    def flush(self):
+        """Block until every queued change is written, without waiting for the debounce."""
+        self._queue.put(FLUSH)
+        self._queue.join()
+
+    def _batch(self):
+        """Wait for the next batch of changes; markers from ``flush`` are part of it."""
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_delay
+        while batch[-1] is not FLUSH and len(batch) < self.max_batch:
+            timeout = min(self.debounce, deadline - time.monotonic())
+            if timeout <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=timeout))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        connection = self._connect()
+        while True:
+            batch = self._batch()
+            try:
+                changes = [change for change in batch if change is not FLUSH]
+                if changes:
+                    self._write(connection, changes)
+            except Exception:  # Keep the thread alive; the changes of this batch are lost
+                logger.exception("Autosave could not write %d changes to %s", len(changes), self.path)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write(self, connection, batch):
+        latest = {}
+        for session, kind, key, payload in batch:
+            if key is None:  # Replacing a kind supersedes the changes of its entities in this batch
+                latest = {entity: row for entity, row in latest.items() if entity[:2] != (session, kind)}
+            latest.pop((session, kind, key), None)
+            latest[(session, kind, key)] = payload  # Re-inserted last, so the order of the batch is kept
+
+        with connection:
+            connection.executemany(
+                "INSERT INTO changes (session, kind, key, payload) VALUES (?, ?, ?, ?)",
+                [(session, kind, key, payload) for (session, kind, key), payload in latest.items()])
+        for session in {session for session, _, _ in latest}:
+            self._compact(connection, session)
+
+    def _compact(self, connection, session):
+        count = connection.execute("SELECT COUNT(*) FROM changes WHERE session = ?", (session,)).fetchone()[0]
+        if count <= self.compact_after:
+            return
+        rows = connection.execute(
+            "SELECT id, kind, key, payload FROM changes WHERE session = ? ORDER BY id", (session,)).fetchall()
+        state = fold_changes([row[1:] for row in rows])
+        with connection:
+            connection.execute("DELETE FROM changes WHERE session = ? AND id <= ?", (session, rows[-1][0]))
+            connection.executemany(
+                "INSERT INTO changes (session, kind, key, payload) VALUES (?, ?, NULL, ?)",
+                [(session, kind, json.dumps(value, ensure_ascii=False)) for kind, value in state.items()])
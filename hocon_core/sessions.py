@@ -0,0 +1,48 @@
+import threading
+import time
+import weakref
+
+
+class SessionRegistry:
+    """Process-wide registry of the live sessions, used to compact the idle ones.
+
+    Every session reports its RevisionStore on each run. Stores of sessions
+    that have not run for ``idle_seconds`` drop their derived views and
+    prepared exports, which are rebuilt when the user comes back. Sessions
+    that ended are forgotten with their store.
+    """
+
+    def __init__(self, idle_seconds=600, sweep_interval=60):
+        self.idle_seconds = idle_seconds
+        self.sweep_interval = sweep_interval
+        self._last_seen = weakref.WeakKeyDictionary()  # RevisionStore -> time of the last run
+        self._compacted = weakref.WeakSet()
+        self._next_sweep = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._last_seen)
+
+    def seen(self, store, now=None):
+        with self._lock:
+            self._last_seen[store] = time.monotonic() if now is None else now
+            self._compacted.discard(store)
+
+    def compact_idle(self, now=None):
+        """Compact the stores of idle sessions; at most once per ``sweep_interval``. Returns how many."""
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if now < self._next_sweep:
+                return 0
+            self._next_sweep = now + self.sweep_interval
+            idle = [
+                store for store, last_seen in self._last_seen.items()
+                if now - last_seen > self.idle_seconds and store not in self._compacted
+            ]
+            for store in idle:
+                store.compact()
+                self._compacted.add(store)
+        return len(idle)
+
+
+session_registry = SessionRegistry()
@@ -0,0 +1,339 @@
+import functools
+import hashlib
+import json
+import re
+import string
+
+from hocon_core.blobs import default_blob_store
+from hocon_core.cache import LRUCache
+from hocon_core.records import Record, Var
+
+
+def build_sub_dict(user_vars):
+    """Build the substitution table from the rows of the Substitution tab."""
+    return {
+        v['var']: v['sub_value']
+        for v in user_vars.values()
+        if v['var'] and v['sub_value']
+    }
+
+
+def new_var():
+    return Var()
+
+
+def load_vars_config(config, user_vars=None):
+    """Append the key/value pairs of a parsed config to ``user_vars``."""
+    user_vars = dict(user_vars or {})
+    for key_var, sub_value in config.items():
+        new_key = max(user_vars.keys(), default=-1) + 1
+        user_vars[new_key] = Var(key_var, sub_value)
+    return user_vars
+
+
+def _references(value):
+    """Return the names referenced by ``$name`` or ``${name}`` in a string value."""
+    if not isinstance(value, str) or '$' not in value:
+        return set()
+    return {
+        match.group('named') or match.group('braced')
+        for match in string.Template.pattern.finditer(value)
+        if match.group('named') or match.group('braced')
+    }
+
+
+def _expand(value, resolved):
+    """Replace the references of ``value`` found in ``resolved``; ``$$`` and other text stay as written.
+
+    Values are inserted into templates verbatim, so unlike ``safe_substitute``
+    this does not unescape ``$$``, whether or not the value references a key.
+    """
+    def replace(match):
+        name = match.group('named') or match.group('braced')
+        return str(resolved[name]) if name in resolved else match.group()
+
+    return string.Template.pattern.sub(replace, value)
+
+
+def _find_cycles(deps, stuck):
+    """Return the groups of ``stuck`` keys that reference each other, directly or not.
+
+    Each group is a strongly connected component of the references (Tarjan's
+    algorithm, without recursion), with its keys in table order.
+    """
+    keys = set(stuck)
+    index, low, stack, on_stack, groups = {}, {}, [], set(), []
+
+    def visit(key, work):
+        index[key] = low[key] = len(index)
+        stack.append(key)
+        on_stack.add(key)
+        work.append((key, iter(deps[key] & keys)))
+
+    for root in stuck:
+        if root in index:
+            continue
+        work = []
+        visit(root, work)
+        while work:
+            key, refs = work[-1]
+            for ref in refs:
+                if ref not in index:
+                    visit(ref, work)
+                    break
+                if ref in on_stack:
+                    low[key] = min(low[key], index[ref])
+            else:
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[key])
+                if low[key] == index[key]:
+                    group = set()
+                    while key not in group:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        group.add(member)
+                    if len(group) > 1 or key in deps[key]:
+                        groups.append(group)
+
+    # Keys that only use a cycle are not part of one
+    cycles = [[key for key in stuck if key in group] for group in groups]
+    order = {key: position for position, key in enumerate(stuck)}
+    return sorted(cycles, key=lambda cycle: order[cycle[0]])
+
+
+def _resolve(mapping):
+    deps = {key: _references(value) & mapping.keys() for key, value in mapping.items()}
+    dependents = {key: [] for key in mapping}
+    waiting = {}
+    for key, refs in deps.items():
+        waiting[key] = len(refs)
+        for ref in refs:
+            dependents[ref].append(key)
+
+    # Kahn's algorithm: a value is expanded once, after every value it references
+    resolved = {}
+    ready = [key for key, count in waiting.items() if count == 0]
+    while ready:
+        key = ready.pop()
+        value = mapping[key]
+        resolved[key] = _expand(value, resolved) if deps[key] else value
+        for dependent in dependents[key]:
+            waiting[dependent] -= 1
+            if waiting[dependent] == 0:
+                ready.append(dependent)
+
+    # Keys left over are in a cycle or reference one; their cyclic references stay as written
+    stuck = [key for key in mapping if key not in resolved]
+    acyclic = dict(resolved)
+    for key in stuck:
+        resolved[key] = _expand(mapping[key], acyclic)
+    return {key: resolved[key] for key in mapping}, _find_cycles(deps, stuck)
+
+
+_resolutions = LRUCache(maxsize=32)  # sub_dict version -> (resolved table, cycles)
+
+
+def _resolution(mapping, version=None):
+    if version is None:
+        version = sub_dict_version(mapping)
+    resolution = _resolutions.get(version)
+    if resolution is None:
+        resolution = _resolve(mapping)
+        _resolutions.put(version, resolution)
+    return resolution
+
+
+def resolve_sub_dict(mapping, version=None):
+    """Return ``mapping`` with the references between its values fully expanded.
+
+    Values may reference other keys, to any depth. The dependency graph is
+    sorted so that each value is expanded once, after the values it uses; the
+    result is memoized per ``sub_dict_version``, so a template then needs a
+    single lookup pass. References that form a cycle are left as written.
+    """
+    return _resolution(mapping, version)[0]
+
+
+def substitution_cycles(mapping, version=None):
+    """Return the groups of keys of ``mapping`` that reference each other, e.g. ``[['a', 'b']]``.
+
+    A key that only uses a cycle is left out, although it is not fully expanded either.
+    """
+    return _resolution(mapping, version)[1]
+
+
+def _trie_pattern(values):
+    """Build a regular expression matching any of ``values``, longest first.
+
+    The values are merged into a prefix tree whose single-child chains are
+    collapsed into literals, so the engine never tries more than one branch
+    per character and the scan cost does not grow with the number of values.
+    """
+    trie = {}
+    for value in values:
+        node = trie
+        for char in value:
+            node = node.setdefault(char, {})
+        node[''] = {}  # A value ends here
+
+    def node_pattern(node):
+        alternatives = []
+        for char, child in node.items():
+            if char == '':
+                continue
+            literal = char
+            while len(child) == 1 and '' not in child:
+                (next_char, child), = child.items()
+                literal += next_char
+            alternatives.append(re.escape(literal) + node_pattern(child))
+        if not alternatives:
+            return ''
+        optional = '' in node
+        if len(alternatives) == 1 and not optional:
+            return alternatives[0]
+        # A greedy optional group tries the longer values before ending here
+        return '(?:' + '|'.join(alternatives) + ')' + ('?' if optional else '')
+
+    try:
+        return node_pattern(trie)
+    except RecursionError:  # Pathologically nested values, fall back to a flat alternation
+        return '|'.join(re.escape(value) for value in sorted(values, key=len, reverse=True))
+
+
+class ReverseSubstituter:
+    """Replace substitution values in text with their ``${key}`` references.
+
+    All values are compiled into one regular expression, so each string is
+    scanned once whatever the number of variables. At each position the
+    longest matching value wins; when several keys share a value the first
+    one is used.
+    """
+
+    def __init__(self, mapping):
+        self.references = {}
+        for key, value in mapping.items():
+            if value not in ('', None):
+                self.references.setdefault(str(value), f'${{{key}}}')
+        self.pattern = re.compile(_trie_pattern(self.references)) if self.references else None
+
+    def __call__(self, text):
+        if self.pattern is None or not text:
+            return text
+        return self.pattern.sub(self._reference, text)
+
+    def _reference(self, match):
+        return self.references[match.group()]
+
+
+@functools.lru_cache(maxsize=32)
+def _cached_reverse_substituter(items):
+    return ReverseSubstituter(resolve_sub_dict(dict(items)))
+
+
+def get_reverse_substituter(mapping):
+    """Return the compiled reverse substituter for this version of ``mapping``.
+
+    Values are matched as they appear once expanded, see ``resolve_sub_dict``.
+    """
+    try:
+        return _cached_reverse_substituter(tuple(mapping.items()))
+    except TypeError:  # Unhashable values, e.g. lists loaded from a key/value file
+        return ReverseSubstituter(resolve_sub_dict(mapping))
+
+
+def replace_value_with_key(text, mapping):
+    """Replace values in text with corresponding keys in ${key} format."""
+    return get_reverse_substituter(mapping)(text)
+
+
+def sub_dict_version(mapping):
+    """Return a fingerprint of a substitution table, independent of key order."""
+    dumped = json.dumps(sorted(mapping.items(), key=lambda item: item[0]), ensure_ascii=False, default=str)
+    return hashlib.sha1(dumped.encode("utf-8")).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _compiled_template(text):
+    return string.Template(text)
+
+
+class ForwardSubstituter:
+    """Expand ``${key}`` references with compiled templates and memoized results.
+
+    Templates are compiled once per distinct string and results are kept in a
+    bounded LRU keyed on ``(string, sub_dict version)``; the results of large
+    texts are kept with the text in the blob store instead. Strings without a
+    ``$`` are returned as they are.
+    """
+
+    def __init__(self, maxsize=16384, blobs=default_blob_store):
+        self.results = LRUCache(maxsize)
+        self.blobs = blobs
+
+    def substitute(self, text, replacements, version):
+        if '$' not in text:
+            return text
+        if len(text) >= self.blobs.min_size:
+            return self.blobs.memo(text, "substitution", version,
+                                   lambda text: _compiled_template(text).safe_substitute(replacements))
+        key = (text, version)
+        result = self.results.get(key)
+        if result is None:
+            result = _compiled_template(text).safe_substitute(replacements)
+            self.results.put(key, result)
+        return result
+
+    def clear(self):
+        self.results.clear()
+
+
+default_substituter = ForwardSubstituter()
+
+
+def replace_strings_in_nested_dict(d, replacements, version=None):
+    """Recursively replace string values in a nested dictionary.
+
+    ``replacements`` is the raw table; references between its values are
+    expanded first (see ``resolve_sub_dict``).
+    """
+    if version is None:
+        version = sub_dict_version(replacements)
+    replacements = resolve_sub_dict(replacements, version)
+    substitute = default_substituter.substitute
+
+    def replace(value):
+        if isinstance(value, (dict, Record)):  # Records come back as plain dicts
+            return {k: replace(v) for k, v in value.items()}
+        elif isinstance(value, list):  # Handle lists of dictionaries or strings
+            return [replace(item) for item in value]
+        elif isinstance(value, str):  # Replace string values
+            return substitute(value, replacements, version)
+        return value  # Return unchanged for other types
+
+    return replace(d)
+
+
+def clear_substitution_caches():
+    """Drop every resolved table, memoized substituter, template, result and text blob, e.g. before a cold benchmark."""
+    _resolutions.clear()
+    _cached_reverse_substituter.cache_clear()
+    _compiled_template.cache_clear()
+    default_substituter.clear()
+    default_blob_store.clear()
+
+
+def remove_empty_values(d):
+    """Recursively remove empty values ('', [], or {}) starting from the deepest level."""
+    if isinstance(d, (dict, Record)):  # Records come back as plain dicts
+        # First process inner dictionaries
+        cleaned_dict = {k: remove_empty_values(v) for k, v in d.items()}
+        # Then remove keys that became empty
+        return {k: v for k, v in cleaned_dict.items() if v not in ('', [], {})}
+
+    elif isinstance(d, list):
+        # Process lists but keep them intact
+        return [remove_empty_values(item) for item in d]
+
+    return d  # Return unchanged for other types
@@ -0,0 +1,62 @@
+import random
+
+from hocon_core.substitution import remove_empty_values
+
+WORDS = ("route", "request", "customer", "order", "invoice", "account", "report", "status", "review", "policy",
+         "ticket", "refund", "delivery", "schedule", "summary", "question", "answer", "record", "search", "update")
+
+PARAM_TYPES = ('string', 'float', 'int', 'object', 'array', 'boolean')
+
+
+def _sentence(rng, words=12):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+
+def synthetic_workload(agents=100, fan_out=3, functions=10, params=3, variables=20, seed=0):
+    """Generate a network, a function library and a key/value table of the given size.
+
+    Agents form a tree below the frontman in which every agent calls up to
+    ``fan_out`` others. Agents share the ``functions`` function specs in turn,
+    and their instructions quote the ``variables`` values, so loading the
+    network turns them back into ``${key}`` references.
+
+    Returns a dict with ``network``, ``functions`` and ``vars``, shaped like
+    the files exported by the editor.
+    """
+    rng = random.Random(seed)
+    sub_dict = {f"var_{i}": f"{_sentence(rng, 6)} ({i})" for i in range(variables)}
+    values = list(sub_dict.values())
+
+    function_library = {}
+    for f in range(functions):
+        properties = {
+            f"param_{p}": {"type": rng.choice(PARAM_TYPES), "description": _sentence(rng, 8)}
+            for p in range(params)
+        }
+        function_library[f"func_{f}"] = {
+            "function": {
+                "description": _sentence(rng),
+                "parameters": {"type": "object", "properties": properties, "required": sorted(properties)[:1]},
+            },
+            "class": f"tools_{f}.Tool{f}",
+        }
+    function_names = list(function_library)
+
+    tools = []
+    for i in range(agents):
+        quoted = " ".join(rng.choice(values) for _ in range(2)) if values else ""
+        agent = {
+            "name": f"agent_{i}",
+            "instructions": f"{_sentence(rng, 20)} {quoted}".strip(),
+            "command": _sentence(rng, 6),
+            "tools": [f"agent_{child}" for child in range(i * fan_out + 1, min((i + 1) * fan_out + 1, agents))],
+            "llm_config": {"model_name": "gpt-4o-2024-08-06", "temperature": 0.5},
+        }
+        if function_names and i:
+            func = function_library[function_names[i % len(function_names)]]
+            agent["function"] = func["function"]
+            agent["class"] = func["class"]
+        tools.append(agent)
+
+    network = {"llm_config": {"model_name": "gpt-4o-2024-08-06", "temperature": 0.5}, "tools": tools}
+    return {"network": remove_empty_values(network), "functions": function_library, "vars": sub_dict}
@@ -0,0 +1,263 @@
+"""Writers that turn editor data into HOCON, JSON or YAML text, chunk by chunk.
+
+The writers walk plain dicts, lists and records directly, without building
+a pyhocon ConfigTree first. Each one yields the document in chunks of about
+``chunk_size`` characters, so a large network can be written to a file as it
+is produced. The HOCON writer produces exactly the text of
+``HOCONConverter.to_hocon(ConfigFactory.from_dict(data))``.
+"""
+import json
+import math
+import os
+import re
+from collections.abc import Mapping
+
+from pyhocon import ConfigFactory, HOCONConverter
+from pyhocon.config_tree import NoneValue
+
+from hocon_core.records import Record
+
+CHUNK_SIZE = 64 * 1024
+INDENT = '  '
+
+# ConfigTree.put splits keys on these characters and strips quotes, so such keys are left to pyhocon
+SPECIAL_KEY_CHARACTERS = frozenset('$}[]:=+#`^?!@*&."')
+HOCON_ESCAPED = re.compile(r'[\x00-\x1F"\\]')
+
+
+def _plain_data(value):
+    if isinstance(value, Mapping):
+        return {key: _plain_data(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_plain_data(item) for item in value]
+    return value
+
+
+def _chunks(units, chunk_size):
+    buffer, length = [], 0
+    for unit in units:
+        buffer.append(unit)
+        length += len(unit)
+        if length >= chunk_size:
+            yield ''.join(buffer)
+            buffer, length = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+# HOCON
+
+def _hocon_key(key):
+    return isinstance(key, str) and key != '' and SPECIAL_KEY_CHARACTERS.isdisjoint(key)
+
+
+def _write_hocon(value, level, out):
+    if isinstance(value, Mapping):
+        if not value:
+            out.append('{}')
+        elif not all(_hocon_key(key) for key in value):  # Dotted or quoted keys are merged into paths by pyhocon
+            out.append(HOCONConverter.to_hocon(ConfigFactory.from_dict(_plain_data(value)), level=level))
+        else:
+            if level > 0:
+                out.append('{\n')
+            indent = INDENT * level
+            separator = ''
+            for key, item in value.items():
+                out.append(f"{separator}{indent}{key}{'' if isinstance(item, Mapping) else ' ='} ")
+                _write_hocon(item, level + 1, out)
+                separator = '\n'
+            if level > 0:
+                out.append('\n' + INDENT * (level - 1) + '}')
+    elif isinstance(value, list):
+        if not value:
+            out.append('[]')
+        else:
+            out.append('[\n')
+            indent = INDENT * level
+            for i, item in enumerate(value):
+                out.append(indent if i == 0 else '\n' + indent)
+                _write_hocon(item, level + 1, out)
+            out.append('\n' + INDENT * (level - 1) + ']')
+    elif isinstance(value, str):
+        if '\n' in value and len(value) > 1:
+            out.append(f'"""{value}"""')
+        elif HOCON_ESCAPED.search(value):
+            out.append(f'"{HOCONConverter._escape_string(value)}"')
+        else:
+            out.append(f'"{value}"')
+    elif value is None:
+        out.append('null')
+    elif value is True:
+        out.append('true')
+    elif value is False:
+        out.append('false')
+    elif isinstance(value, (int, float)):
+        out.append(str(value))
+    else:  # Config values, durations and other pyhocon types
+        out.append(HOCONConverter.to_hocon(value, level=level))
+
+
+def hocon_value(value, level=0):
+    """Return the HOCON text of ``value`` as nested ``level`` deep, like ``HOCONConverter.to_hocon``."""
+    out = []
+    _write_hocon(value, level, out)
+    return ''.join(out)
+
+
+def _hocon_units(data):
+    if not isinstance(data, Mapping) or not data or not all(_hocon_key(key) for key in data):
+        yield hocon_value(data)
+        return
+    separator = ''
+    for key, item in data.items():
+        if isinstance(item, list) and item:  # Lists, such as the agents of a network, are written item by item
+            yield f"{separator}{key} = [\n"
+            for i, element in enumerate(item):
+                yield (INDENT if i == 0 else '\n' + INDENT) + hocon_value(element, 2)
+            yield '\n]'
+        else:
+            yield f"{separator}{key}{'' if isinstance(item, Mapping) else ' ='} " + hocon_value(item, 1)
+        separator = '\n'
+
+
+def iter_hocon(data, chunk_size=CHUNK_SIZE):
+    return _chunks(_hocon_units(data), chunk_size)
+
+
+# JSON
+
+def _json_default(obj):
+    if isinstance(obj, Record):
+        return obj.to_dict()
+    if isinstance(obj, NoneValue):
+        return None
+    return str(obj)
+
+
+def iter_json(data, chunk_size=CHUNK_SIZE):
+    """Yield ``json.dumps(data, indent=2, ensure_ascii=False)`` in chunks."""
+    encoder = json.JSONEncoder(ensure_ascii=False, indent=2, default=_json_default)
+    return _chunks(encoder.iterencode(data), chunk_size)
+
+
+# YAML
+
+YAML_PLAIN = re.compile(r'[A-Za-z_][A-Za-z0-9_ ./-]*')
+YAML_RESERVED = frozenset(('y', 'yes', 'n', 'no', 'true', 'false', 'on', 'off', 'null'))
+YAML_BLOCK_UNSAFE = re.compile('[\x00-\x08\x0b-\x1f\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff]')
+YAML_UNPRINTABLE = re.compile('[\x7f-\x9f\u2028\u2029\ufeff\ufffe\uffff]')
+
+
+def _yaml_string(text):
+    if YAML_PLAIN.fullmatch(text) and not text.endswith(' ') and text.lower() not in YAML_RESERVED:
+        return text
+    # JSON strings are YAML double-quoted scalars, once the characters YAML does not print are escaped
+    return YAML_UNPRINTABLE.sub(lambda match: f"\\u{ord(match.group()):04x}", json.dumps(text, ensure_ascii=False))
+
+
+def _yaml_scalar(value, level):
+    if isinstance(value, str):
+        if '\n' in value and value[0] not in ' \n' and not YAML_BLOCK_UNSAFE.search(value):
+            # Literal block; the chomping indicator keeps the trailing line breaks exact
+            if not value.endswith('\n'):
+                header, body = '|-', value
+            else:
+                header, body = ('|+' if value.endswith('\n\n') else '|'), value[:-1]
+            indent = INDENT * level
+            return header + ''.join('\n' + indent + line if line else '\n' for line in body.split('\n'))
+        return _yaml_string(value)
+    if isinstance(value, Mapping):
+        return '{}'
+    if isinstance(value, list):
+        return '[]'
+    if value is None or isinstance(value, NoneValue):
+        return 'null'
+    if value is True:
+        return 'true'
+    if value is False:
+        return 'false'
+    if isinstance(value, float) and not math.isfinite(value):
+        return '.nan' if math.isnan(value) else ('.inf' if value > 0 else '-.inf')
+    if isinstance(value, float):
+        text = repr(value)
+        return text if '.' in text or 'e' not in text else text.replace('e', '.0e')  # YAML 1.1 wants the dot
+    if isinstance(value, int):
+        return str(value)
+    return _yaml_string(str(value))
+
+
+def _write_yaml_mapping(mapping, level, out, first_prefix=None):
+    indent = INDENT * level
+    for i, (key, item) in enumerate(mapping.items()):
+        prefix = first_prefix if i == 0 and first_prefix is not None else indent
+        key = _yaml_string(str(key))
+        if isinstance(item, Mapping) and item:
+            out.append(f"{prefix}{key}:\n")
+            _write_yaml_mapping(item, level + 1, out)
+        elif isinstance(item, list) and item:
+            out.append(f"{prefix}{key}:\n")
+            _write_yaml_sequence(item, level + 1, out)
+        else:
+            out.append(f"{prefix}{key}: {_yaml_scalar(item, level + 1)}\n")
+
+
+def _write_yaml_sequence(sequence, level, out):
+    indent = INDENT * level
+    for item in sequence:
+        if isinstance(item, Mapping) and item:
+            _write_yaml_mapping(item, level + 1, out, first_prefix=indent + '- ')
+        elif isinstance(item, list) and item:
+            out.append(indent + '-\n')
+            _write_yaml_sequence(item, level + 1, out)
+        else:
+            out.append(f"{indent}- {_yaml_scalar(item, level + 1)}\n")
+
+
+def _yaml_units(data):
+    if isinstance(data, Mapping) and data:
+        for key, item in data.items():
+            if isinstance(item, list) and item:
+                yield f"{_yaml_string(str(key))}:\n"
+                for element in item:
+                    out = []
+                    _write_yaml_sequence([element], 1, out)
+                    yield ''.join(out)
+            else:
+                out = []
+                _write_yaml_mapping({key: item}, 0, out)
+                yield ''.join(out)
+    elif isinstance(data, list) and data:
+        out = []
+        _write_yaml_sequence(data, 0, out)
+        yield ''.join(out)
+    else:
+        yield _yaml_scalar(data, 0) + '\n'
+
+
+def iter_yaml(data, chunk_size=CHUNK_SIZE):
+    return _chunks(_yaml_units(data), chunk_size)
+
+
+WRITERS = {"hocon": iter_hocon, "json": iter_json, "yaml": iter_yaml}
+EXTENSIONS = {"hocon": ".hocon", "json": ".json", "yaml": ".yaml"}
+FORMAT_EXTENSIONS = {"hocon": (".hocon", ".conf"), "json": (".json",), "yaml": (".yaml", ".yml")}
+
+
+def output_file_name(file_name, output_format):
+    """Return ``file_name`` with an extension of ``output_format``.
+
+    An extension of that format is kept as typed, e.g. ``.conf`` for HOCON;
+    the extension of another format is replaced, and any other name gets
+    ``EXTENSIONS[output_format]`` appended.
+    """
+    stem, extension = os.path.splitext(file_name)
+    if extension.lower() in FORMAT_EXTENSIONS[output_format]:
+        return file_name
+    if any(extension.lower() in extensions for extensions in FORMAT_EXTENSIONS.values()):
+        return stem + EXTENSIONS[output_format]
+    return file_name + EXTENSIONS[output_format]
+
+
+def write_text(data, output_format="hocon"):
+    """Return the whole document in ``output_format``: one of ``WRITERS``."""
+    return ''.join(WRITERS[output_format](data))
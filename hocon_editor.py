@@ -1,6 +1,9 @@
+import autosave
+import diagnostics
 import streamlit as st
 from create_load_tab import create_tab_content
 from function_tab import function_tab_content
+from hocon_core import RevisionStore, session_registry
 from llm_tab import llm_tab_content
 from network_tab import network_tab_content
 from sidebar import sidebar_content
@@ -11,26 +14,46 @@ st.set_page_config(page_title="HOCON editor", layout="centered")
 
 st.session_state.add_input = 0
 st.session_state.add_func_param = {}
+st.session_state.shown_downloads = {}  # Filled by the download buttons of this run
+
+# Revisions of agents, functions and variables; derived views are only rebuilt after they change
+if "revisions" not in st.session_state:
+    st.session_state.revisions = RevisionStore()
+    autosave.start_session()  # Brings back the session named in the URL
+
+# Sessions that went idle give their derived views and prepared files back
+session_registry.seen(st.session_state.revisions)
+session_registry.compact_idle()
 
 # Initialize session state for sidebar visibility
 if "show_sidebar" not in st.session_state:
     st.session_state.show_sidebar = False  # Sidebar starts hidden
 
-create, llm, network, function, substitution = st.tabs(['Create/Load', 'Default LLM', 'Network', 'Functions', 'Substitution'])
+tab_names = ['Create/Load', 'Default LLM', 'Network', 'Functions', 'Substitution']
+if diagnostics.enabled():
+    tab_names.append('Diagnostics')
+
+with diagnostics.record_run():
+    create, llm, network, function, substitution, *diagnostics_tab = st.tabs(tab_names)
+
+    with create, diagnostics.timed("create_tab_content"):
+        create_tab_content()
 
-with create:
-    create_tab_content()
+    with llm, diagnostics.timed("llm_tab_content"):
+        llm_tab_content()
 
-with llm:
-    llm_tab_content()
+    with network, diagnostics.timed("network_tab_content"):
+        network_tab_content()
 
-with network:
-    network_tab_content()
+    with function, diagnostics.timed("function_tab_content"):
+        function_tab_content()
 
-with function:
-    function_tab_content()
+    with substitution, diagnostics.timed("substitution_tab_content"):
+        substitution_tab_content()
 
-with substitution:
-    substitution_tab_content()
+    with diagnostics.timed("sidebar_content"):
+        sidebar_content()
 
-sidebar_content()
+    if diagnostics_tab:
+        with diagnostics_tab[0]:
+            diagnostics.diagnostics_tab_content()
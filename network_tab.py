@@ -1,38 +1,76 @@
 import streamlit as st
 from streamlit_agraph import agraph, Node, Edge, Config
 
+from diagnostics import rerun
+from hocon_core import aggregate_parent, compute_layout, drilldown_view, network_topology
+
+
+def full_graph(nodes, edges):
+    # Positions are computed once per topology and cached, so the browser never lays the graph out
+    positions = compute_layout(nodes, edges, 'layered' if st.session_state.hierarchical else 'force')
+    return ([Node(id=name, label=name, size=30, x=positions[name][0], y=positions[name][1]) for name in nodes],
+            [Edge(source=source, target=target) for source, target in edges])
+
+
+def drilldown_graph(nodes, edges, depth):
+    root = st.session_state.inputs[0]['name'] if 0 in st.session_state.inputs else ''
+    visible, visible_edges, unreachable = drilldown_view(nodes, edges, root, depth, st.session_state.drill_expanded)
+    if unreachable:
+        st.caption(f"{unreachable} agents are not reachable from the frontman and are not shown.")
+
+    positions = compute_layout([node_id for node_id, _, _ in visible], visible_edges, 'layered')
+    graph_nodes = [
+        Node(id=node_id, label=label, size=20 if hidden else 30, shape="box" if hidden else "dot",
+             title=f"{hidden} more agents, click to expand" if hidden else node_id,
+             x=positions[node_id][0], y=positions[node_id][1])
+        for node_id, label, hidden in visible
+    ]
+    return graph_nodes, [Edge(source=source, target=target) for source, target in visible_edges]
+
+
+@st.fragment
+def network_graph():
+    """The graph and its view controls; clicking nodes only reruns this fragment."""
+    st.session_state.hierarchical = st.toggle("Hierarchical view")
+    drilldown = st.toggle("Drill-down view", key="drilldown", help="Start at the frontman and expand subtrees on click")
+
+    nodes, edges = st.session_state.revisions.derive(
+        "topology", ("agents",), lambda: network_topology(st.session_state.get("inputs", {})))
+
+    if drilldown:
+        if "drill_expanded" not in st.session_state:
+            st.session_state.drill_expanded = frozenset()
+        depth = st.slider("Depth", 1, 6, 2, key="drill_depth")
+        graph_nodes, graph_edges = drilldown_graph(nodes, edges, depth)
+    else:
+        graph_nodes, graph_edges = full_graph(nodes, edges)
+
+    config = Config(width=750,
+                    height=500,
+                    directed=True,
+                    physics=False,
+                    hierarchical=False,
+                    )
+
+    clicked = agraph(nodes=graph_nodes, edges=graph_edges, config=config)
+
+    # Clicking an aggregate expands its subtree, clicking an expanded agent collapses it again
+    if drilldown and clicked and clicked != st.session_state.get("drill_last_click"):
+        st.session_state.drill_last_click = clicked
+        parent = aggregate_parent(clicked)
+        if parent is not None:
+            st.session_state.drill_expanded = st.session_state.drill_expanded | {parent}
+        elif clicked in st.session_state.drill_expanded:
+            st.session_state.drill_expanded = st.session_state.drill_expanded - {clicked}
+        else:
+            return
+        rerun(scope="fragment")
+
 
 def network_tab_content():
     if 'hierarchical' in st.session_state:
         st.title("Network of Agents")
-
-        nodes = []
-        edges = []
-
-        st.session_state.hierarchical = st.toggle("Hierarchical view")
-
-        if "inputs" in st.session_state and st.session_state.inputs:
-            for _, v in st.session_state.inputs.items():
-                name = v['name']
-                if name != '':
-                    nodes.append(Node(id=name, label=name, size=30))
-                    if v['tools']:
-                        for i in v['tools']:
-                            edges.append(Edge(source=name, target=i))
-
-        config = Config(width=750,
-                        height=500,
-                        directed=True,
-                        physics=False,
-                        hierarchical=st.session_state.hierarchical,
-                        )
-
-        # st.session_state.hierarchical = st.toggle("Hierarchical view")
-        # st.write(st.session_state.hierarchical)
-
-        agraph(nodes=nodes,
-            edges=edges,
-            config=config)
+        network_graph()
 
     else:
         st.write('Please create or load agent network on the "Create/Load" first.')
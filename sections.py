@@ -0,0 +1,22 @@
+import contextlib
+
+import streamlit as st
+
+
+@contextlib.contextmanager
+def lazy_section(label, key, summary=""):
+    """Collapsible section whose widgets are only built while it is open.
+
+    Unlike ``st.expander``, which always builds and sends its content, the
+    section is opened with a toggle stored under ``key``; while it is closed
+    only ``summary`` is shown. Yields whether the section is open:
+
+        with lazy_section("Details", "expander_0", "3 parameters") as is_open:
+            if is_open:
+                ...
+    """
+    with st.container(border=True):
+        is_open = st.toggle(label, key=key)
+        if not is_open and summary:
+            st.caption(summary)
+        yield is_open
@@ -1,274 +1,379 @@
-from pyhocon import ConfigFactory, HOCONConverter
+import copy
+
 import streamlit as st
-import string
-
-LLM_MODEL_DICT = {
-    "gpt-4.5-preview": "gpt-4.5-preview-2025-02-27",
-    "gpt-4o": "gpt-4o-2024-08-06",
-    "gpt-4o-mini": "gpt-4o-mini-2024-07-18",
-    "o1": "o1-2024-12-17",
-    "o1-mini": "o1-mini-2024-09-12",
-    "o3-mini": "o3-mini-2025-01-31",
-    "o1-preview": "o1-preview-2024-09-12",
-    "Claude 3.7 Sonnet": "claude-3-7-sonnet-20250219",
-    "Claude 3.5 Haiku": "claude-3-5-haiku-20241022",
-    "Claude 3.5 Sonnet v2": "claude-3-5-sonnet-20241022",
-    "Claude 3.5 Sonnet": "claude-3-5-sonnet-20240620",
-    "Claude 3 Opus": "claude-3-opus-20240229",
-    "Claude 3 Sonnet": "claude-3-sonnet-20240229",
-    "Claude 3 Haiku": "claude-3-haiku-20240307"
-}
+
+from export_jobs import export_controls, refresh_stale_downloads
+from hocon_core import (LLM_MODEL_NAMES, AgentIndex, SearchIndex, clamp_page, match_agents, network_text, new_agent,
+                        page_count, page_of, page_slice, replace_text, set_function, set_llm)
+from sections import lazy_section
+
+PAGE_SIZES = [10, 20, 50, 100]
+BULK_OPERATIONS = ["Set LLM", "Attach function", "Find and replace"]
+KEEP_CURRENT = "Keep current"
+AGENT_WIDGETS = ["model_name", "temperature", "function", "instructions", "command"]  # Per-agent widgets a bulk edit can outdate
+
+
+def get_agent_index():
+    """Return the index of the current network, rebuilding it when the network was replaced."""
+    index = st.session_state.get("agent_index")
+    if index is None or index.inputs is not st.session_state.inputs:
+        index = st.session_state.agent_index = AgentIndex(st.session_state.inputs)
+    return index
+
+
+def get_search_index():
+    """Return the session's search index, re-indexing the agents, functions and variables that changed."""
+    index = st.session_state.get("search_index")
+    if index is None:
+        index = st.session_state.search_index = SearchIndex()
+    revisions = st.session_state.revisions
+    index.sync(revisions, "agents", st.session_state.inputs)
+    index.sync(revisions, "functions", st.session_state.functions)
+    index.sync(revisions, "vars", st.session_state.user_vars)
+    return index
+
+
+def touch_agent(*keys):
+    st.session_state.revisions.touch("agents", *keys)
+
+
+def set_agent_name(key):
+    new_name = st.session_state[f"input_{key}"]
+    index = get_agent_index()
+
+    # Enforce uniqueness
+    if new_name != st.session_state.inputs[key]["name"] and new_name in index:
+        st.session_state.errors[key] = f"❌ '{new_name}' is already in used. Choose a different name."
+    else:
+        st.session_state.errors[key] = ""  # Clear error if valid
+        callers = index.callers(st.session_state.inputs[key]["name"])
+        index.rename(key, new_name)  # Callers follow the new name
+        touch_agent(key, *callers)
+
+
+def set_agent_tools(key):
+    get_agent_index().set_tools(key, st.session_state[f"connections_{key}"])
+    touch_agent(key)
+
+
+def set_agent_text(key, field):
+    st.session_state.inputs[key][field] = st.session_state[f"{field}_{key}"]
+    st.session_state[f"expander_{key}"] = True  # Keep open while editing
+    touch_agent(key)
+
+
+def set_agent_function(key):
+    f_name = st.session_state[f"function_{key}"]
+    st.session_state.function_names[key] = f_name
+    if st.session_state.function_results:
+        if f_name is None:
+            st.session_state.inputs[key]["function"] = {}
+            st.session_state.inputs[key]["class"] = ''
+        else:
+            st.session_state.inputs[key]["function"] = st.session_state.function_results[f_name]['function']
+            st.session_state.inputs[key]["class"] = st.session_state.function_results[f_name]['class']
+        touch_agent(key)
+
+
+def set_agent_llm(key):
+    st.session_state.inputs[key]['llm_config']['model_name'] = st.session_state[f"model_name_{key}"]
+    st.session_state.inputs[key]['llm_config']['temperature'] = st.session_state[f"temperature_{key}"]
+    touch_agent(key)
+
+
+def add_input():
+    new_key = max(st.session_state.inputs.keys(), default=-1) + 1
+    st.session_state.inputs[new_key] = new_agent(st.session_state.llm_model, st.session_state.temperature)
+    get_agent_index().add(new_key)
+    touch_agent(new_key)
+    st.session_state.function_names[new_key] = ""
+    st.session_state.errors[new_key] = ""  # Initialize error tracking
+    st.session_state.agent_page = page_count(len(st.session_state.inputs), st.session_state.agent_page_size) - 1  # Show the new agent
+
+
+def remove_input(key):
+    if len(st.session_state.inputs) > 1:
+        index = get_agent_index()
+        callers = index.callers(st.session_state.inputs[key]["name"])
+        index.remove(key)  # Also removes the deleted node from its callers' connections
+        touch_agent(key, *callers)
+        del st.session_state.function_names[key]
+        st.session_state.errors.pop(key, None)  # Remove associated error
+
+
+def bulk_targets():
+    any_model = st.session_state.bulk_model_filter == "Any model"
+    return match_agents(st.session_state.inputs, st.session_state.bulk_name_filter,
+                        model_name=None if any_model else st.session_state.bulk_model_filter)
+
+
+def apply_bulk_edit():
+    """Apply the bulk edit form to every matching agent as one change, so it costs a single rerun."""
+    operation = st.session_state.bulk_operation
+    inputs = st.session_state.inputs
+    keys = bulk_targets()
+
+    if operation == "Set LLM":
+        model_name = st.session_state.bulk_model
+        temperature = None if st.session_state.bulk_keep_temperature else st.session_state.bulk_temperature
+        changed = set_llm(inputs, keys, None if model_name == KEEP_CURRENT else model_name, temperature)
+        message = f"Set the LLM of {len(changed)} agents."
+    elif operation == "Attach function":
+        f_name = st.session_state.bulk_function
+        changed = set_function(inputs, st.session_state.function_names, keys, f_name,
+                               st.session_state.function_results.get(f_name))
+        message = f"{'Attached' if f_name else 'Detached'} the function of {len(changed)} agents."
+    else:
+        changed, count = replace_text(inputs, keys, st.session_state.bulk_find, st.session_state.bulk_replace,
+                                      fields=st.session_state.bulk_fields, match_case=st.session_state.bulk_match_case)
+        message = f"Replaced {count} occurrences in {len(changed)} agents."
+
+    if changed:
+        touch_agent(*changed)
+        # Widgets keep their own value once rendered; drop them so they show the new one
+        for key in changed:
+            for widget in AGENT_WIDGETS:
+                st.session_state.pop(f"{widget}_{key}", None)
+    st.session_state.bulk_message = message
+
+
+def bulk_edit():
+    """Changes to many agents at once; the form only reruns the app when it is applied."""
+    with st.expander("🛠️ Bulk edit"):
+        operation = st.selectbox("Operation", BULK_OPERATIONS, key="bulk_operation")
+        with st.form("bulk_edit_form", border=False):
+            st.text_input("Agents whose name contains", key="bulk_name_filter", placeholder="All agents")
+            st.selectbox("Agents using", ["Any model", *LLM_MODEL_NAMES], key="bulk_model_filter")
+
+            if operation == "Set LLM":
+                st.selectbox("Model", [KEEP_CURRENT, *LLM_MODEL_NAMES], key="bulk_model")
+                st.checkbox("Keep current temperature", value=True, key="bulk_keep_temperature")
+                st.slider("Temperature", 0.0, 1.0, st.session_state.temperature, key="bulk_temperature")
+            elif operation == "Attach function":
+                st.selectbox("Function", [None, *st.session_state.function_results], key="bulk_function",
+                             format_func=lambda name: "No function" if name is None else name)
+            else:
+                st.text_input("Find", key="bulk_find")
+                st.text_input("Replace with", key="bulk_replace")
+                st.multiselect("In", ["instructions", "command"], default=["instructions", "command"], key="bulk_fields")
+                st.checkbox("Match case", value=True, key="bulk_match_case")
+
+            st.form_submit_button("Apply to matching agents", on_click=apply_bulk_edit)
+
+        if st.session_state.get("bulk_message"):
+            st.success(st.session_state.pop("bulk_message"))
+
+
+def set_agent_page():
+    st.session_state.agent_page = st.session_state.agent_page_input - 1
+
+
+def set_agent_page_size():
+    first_key = page_slice(list(st.session_state.inputs), st.session_state.agent_page, st.session_state.agent_page_size)[0]
+    st.session_state.agent_page_size = st.session_state.agent_page_size_input
+    st.session_state.agent_page = page_of(list(st.session_state.inputs), first_key, st.session_state.agent_page_size)
+
+
+def jump_to_agent():
+    key = st.session_state.agent_jump
+    if key in st.session_state.inputs:
+        st.session_state.agent_page = page_of(list(st.session_state.inputs), key, st.session_state.agent_page_size)
+        st.session_state[f"expander_{key}"] = True
+
+
+def agent_pager(input_keys):
+    """Search-to-jump and page selection; only the agents of the current page get widgets."""
+    if "agent_page_size" not in st.session_state:
+        st.session_state.agent_page_size = PAGE_SIZES[1]
+
+    page_size = st.session_state.agent_page_size
+    st.session_state.agent_page = clamp_page(st.session_state.get("agent_page", 0), len(input_keys), page_size)
+
+    query = st.text_input("🔎 Search", key="agent_search",
+                          placeholder="Names, instructions, commands, functions, variables")
+    if query:
+        index = get_search_index()
+        matches = index.search(query)
+        labels = {}  # Agent key -> its name and the first field that matched
+        for kind, key, field in matches:
+            if kind == "agents" and key not in labels:
+                name = st.session_state.inputs[key]["name"] or "Node"
+                labels[key] = f"{name} · {field}: {index.snippet((kind, key, field), query)}"
+        if labels:
+            st.selectbox("Jump to", options=list(labels), index=None, key="agent_jump", format_func=labels.get,
+                         on_change=jump_to_agent)
+        elsewhere = [document for document in matches if document[0] != "agents"]
+        for kind, key, field in elsewhere[:5]:
+            tab = "Functions" if kind == "functions" else "Substitution"
+            st.caption(f"{tab} tab · {field}: {index.snippet((kind, key, field), query)}")
+        if not matches:
+            st.caption("Nothing matches.")
+
+    pages = page_count(len(input_keys), page_size)
+    left, right = st.columns([1, 1])
+    with left:
+        st.number_input(f"Page (of {pages})", min_value=1, max_value=pages, value=st.session_state.agent_page + 1,
+                        key="agent_page_input", on_change=set_agent_page)
+    with right:
+        st.selectbox("Agents per page", options=PAGE_SIZES, index=PAGE_SIZES.index(page_size),
+                     key="agent_page_size_input", on_change=set_agent_page_size)
+
+    first = st.session_state.agent_page * page_size
+    st.caption(f"Agents {first + 1}–{min(first + page_size, len(input_keys))} of {len(input_keys)}")
+
+    return page_slice(input_keys, st.session_state.agent_page, page_size)
+
+
+@st.fragment
+def agent_details(key):
+    """Details and LLM of one agent.
+
+    Like the rows of the Functions and Substitution tabs, this is a fragment:
+    edits here only rerun it, and it may run for an agent that was removed
+    since the last full run, in which case it draws nothing.
+    """
+    agent = st.session_state.inputs.get(key)
+    if agent is None:
+        return
+    refresh_stale_downloads()
+
+    # Collapsed sections only send a summary; their widgets are built when opened
+    function_name = st.session_state.function_names[key]
+    summary = f"Function: {function_name or 'none'} · {len(agent['instructions'])} characters of instructions"
+    with lazy_section("Details", f"expander_{key}", summary) as is_open:
+        if is_open:
+            st.text_area(
+                "Instructions", value=agent["instructions"],
+                key=f"instructions_{key}",
+                help='Detail of task for the agent',
+                on_change=set_agent_text, args=(key, "instructions"),
+            )
+            st.text_area(
+                "Command", value=agent["command"],
+                key=f"command_{key}",
+                help='User-like message intended for an agent after receiving all the inputs',
+                on_change=set_agent_text, args=(key, "command"),
+            )
+
+            def safe_index(lst, item):
+                return lst.index(item) + 1 if item in lst else None
+
+            func_name_list = st.session_state.revisions.derive(
+                "function_options", ("functions",), lambda: list(st.session_state.function_results))
+            st.selectbox(
+                label="function",
+                options=[None] + func_name_list,
+                index=safe_index(func_name_list, function_name),
+                key=f"function_{key}",
+                help="Function called by the agent",
+                on_change=set_agent_function, args=(key,),
+            )
+
+    llm_config = agent['llm_config']
+    with lazy_section("LLM", f"llm_expander_{key}", f"{llm_config['model_name']} · temperature {llm_config['temperature']}") as is_open:
+        if is_open:
+            st.selectbox(label="Model",
+                         options=LLM_MODEL_NAMES,
+                         index=LLM_MODEL_NAMES.index(llm_config['model_name']),
+                         key=f"model_name_{key}",
+                         help='Large langauge model',
+                         on_change=set_agent_llm, args=(key,),
+                         )
+            st.slider("Temperature", 0.0, 1.0, llm_config['temperature'],
+                      key=f"temperature_{key}",
+                      help='High for creativity, low for precision.',
+                      on_change=set_agent_llm, args=(key,),
+                      )
+
+
+def set_network_file_name():
+    st.session_state.network_file_name = st.session_state.network_file_name_input
+
+
+def network_snapshot(output_format):
+    # Callbacks edit the agents in place, so the worker gets its own copy
+    inputs = copy.deepcopy(st.session_state.inputs)
+    llm_model, temperature, sub_dict = st.session_state.llm_model, st.session_state.temperature, st.session_state.sub_dict
+    return lambda: network_text(inputs, llm_model, temperature, sub_dict, output_format)
+
+
+@st.fragment
+def network_export():
+    """Build the network file on the export worker only when asked, so edits never pay for it."""
+    st.text_input("Enter agent network name", st.session_state.network_file_name,
+                  key="network_file_name_input", on_change=set_network_file_name)
+
+    disabled = any(list(st.session_state.errors.values()) + list(st.session_state.function_errors.values()))
+
+    # Converted again only after the network or the variables changed; HOCON only converts the changed agents
+    export_controls("network", ("agents", "network", "vars"),
+                    "📄 Prepare File", "💾 Download File", st.session_state.network_file_name,
+                    network_snapshot, disabled=disabled)
+
+    if disabled:
+        st.error('🛠️ Please fix the error before downloading.')
 
 
 def sidebar_content():
     if st.session_state.show_sidebar:
         with st.sidebar:
-            # Function to add a new input box
-            def add_input():
-                new_key = max(st.session_state.inputs.keys(), default=-1) + 1
-                st.session_state.inputs[new_key] = {
-                    "name": "",
-                    "class": "",
-                    "function": {},
-                    "instructions": "",
-                    "command": "",
-                    "tools": [],
-                    "llm_config": {"model_name": st.session_state.llm_model, "temperature": st.session_state.temperature}
-                }
-                st.session_state.function_names[new_key] = ""
-                st.session_state.errors[new_key] = ""  # Initialize error tracking
-
-            # Function to remove a specific input box
-            def remove_input(key):
-                if len(st.session_state.inputs) > 1:
-                    deleted_node = st.session_state.inputs[key]["name"]
-                    del st.session_state.inputs[key]
-                    del st.session_state.function_names[key]
-                    del st.session_state.errors[key]  # Remove associated error
-
-                    # Remove deleted node from all connection lists
-                    for index in st.session_state.inputs:
-                        st.session_state.inputs[index]['tools'] = [
-                            conn for conn in st.session_state.inputs[index]['tools'] if conn != deleted_node
-                        ]
-                    st.rerun()  # Forces immediate UI update
-
-            def replace_strings_in_nested_dict(d, replacements):
-                """Recursively replace string values in a nested dictionary."""
-                if isinstance(d, dict):
-                    return {k: replace_strings_in_nested_dict(v, replacements) for k, v in d.items()}
-                elif isinstance(d, list):  # Handle lists of dictionaries or strings
-                    return [replace_strings_in_nested_dict(item, replacements) for item in d]
-                elif isinstance(d, str):  # Replace string values
-                    return string.Template(d).safe_substitute(replacements)
-                return d  # Return unchanged for other types
-
-            def remove_empty_values(d):
-                """Recursively remove empty values ('', [], or {}) starting from the deepest level."""
-                if isinstance(d, dict):
-                    # First process inner dictionaries
-                    cleaned_dict = {k: remove_empty_values(v) for k, v in d.items()}
-                    # Then remove keys that became empty
-                    return {k: v for k, v in cleaned_dict.items() if v not in ('', [], {})}
-
-                elif isinstance(d, list):  
-                    # Process lists but keep them intact
-                    return [remove_empty_values(item) for item in d]
-
-                return d  # Return unchanged for other types
-
             st.title("Agents Input Fields")
 
             input_keys = list(st.session_state.inputs.keys())  # Store keys to avoid modifying while iterating
 
-            to_remove = None  # Store key to remove
-            filters_changed = False  # Track if we need to rerun Streamlit
-
             # Precompute available options before iterating over inputs
-            available_options = [node["name"] for node in st.session_state.inputs.values() if node["name"]]
-            existing_names = set(node["name"] for node in st.session_state.inputs.values())
+            index = get_agent_index()
+            available_options = index.names()
 
-            for key in input_keys:
-                st.session_state.errors[key] = ''
+            bulk_edit()
+
+            for key in agent_pager(input_keys):
+                agent = st.session_state.inputs[key]
                 cols = st.columns([4, 1])
                 with cols[0]:
                     # Node name input
-                    prev_name = st.session_state.inputs[key]["name"]
                     if key == 0:
-                        new_name = st.text_input("Name of frontman", value=prev_name, key=f"input_{key}", help='Name of an agent that is the default point of contact to users')
+                        st.text_input("Name of frontman", value=agent["name"], key=f"input_{key}", help='Name of an agent that is the default point of contact to users',
+                                      on_change=set_agent_name, args=(key,))
                     else:
-                        new_name = st.text_input("Name", value=prev_name, key=f"input_{key}", help='Name of agent or tool')
-
-                    # Enforce uniqueness
-                    if new_name != prev_name:
-                        if new_name in existing_names:
-                            st.session_state.errors[key] = f"❌ '{new_name}' is already in used. Choose a different name."
-                        else:
-                            st.session_state.errors[key] = ""  # Clear error if valid
-                            existing_names.discard(prev_name)  # Remove old value
-                            existing_names.add(new_name)  # Add new value
-                            st.session_state.inputs[key]["name"] = new_name
-                            st.rerun()
+                        st.text_input("Name", value=agent["name"], key=f"input_{key}", help='Name of agent or tool',
+                                      on_change=set_agent_name, args=(key,))
 
                     # Display inline error if node name is duplicate
                     if st.session_state.errors.get(key):
                         st.error(st.session_state.errors[key])
 
                 # Filter available options, excluding the current node
-                options = [node for node in available_options if node and node != new_name]
+                options = [node for node in available_options if node != agent["name"]]
 
-                # Ensure connections contain only valid nodes
-                filtered_connections = [conn for conn in st.session_state.inputs[key]['tools'] if conn in options]
-                if filtered_connections != st.session_state.inputs[key]['tools']:
-                    st.session_state.inputs[key]['tools'] = filtered_connections
-                    filters_changed = True  # Mark as changed
+                # Ensure connections contain only valid nodes, e.g. after loading a file with dangling references
+                if any(conn not in index or conn == agent["name"] for conn in agent['tools']):
+                    index.set_tools(key, [conn for conn in agent['tools'] if conn in index and conn != agent["name"]])
+                    touch_agent(key)
 
                 # Render Multiselect for connections
-                selected_connections = st.multiselect(
+                st.multiselect(
                     "Points to",
                     options=options,
-                    default=st.session_state.inputs[key]['tools'],
+                    default=agent['tools'],
                     key=f"connections_{key}",
-                    help='Agents or tools that this node calls'
+                    help='Agents or tools that this node calls',
+                    on_change=set_agent_tools, args=(key,),
                 )
 
-                # Detect selection changes and update state
-                if selected_connections != st.session_state.inputs[key]['tools']:
-                    st.session_state.inputs[key]['tools'] = selected_connections
-                    filters_changed = True  # Mark as changed
-
                 with cols[1]:
                     if key != 0:
-                        if st.button("❌", key=f"remove_{key}"):
-                            to_remove = key  # Mark for removal
-
-                # Track expander state manually
-                expander_key = f"expander_{key}"
-                if expander_key not in st.session_state:
-                    st.session_state[expander_key] = False  # Default to collapsed
-
-                # Expander for each input (contains "instructions", "command", and "function")
-                with st.expander(f"Details for '{st.session_state.inputs[key]['name'] or 'Node'}'", expanded=st.session_state[expander_key]) as expander:
-                    prev_instr = st.session_state.inputs[key]["instructions"]
-                    new_instr = st.text_area(
-                        "Instructions", value=st.session_state.inputs[key]["instructions"],
-                        key=f"instructions_{key}",
-                        help='Detail of task for the agent'
-                    )
-                    if new_instr != prev_instr:
-                        st.session_state.inputs[key]["instructions"] = new_instr
-                        st.session_state[expander_key] = True  # Force open when renaming
-                        st.rerun()
-                    prev_command = st.session_state.inputs[key]["command"]
-                    new_command = st.text_area(
-                        "Command", value=st.session_state.inputs[key]["command"],
-                        key=f"command_{key}",
-                        help='User-like message intended for an agent after receiving all the inputs'
-                    )
-                    if new_command != prev_command:
-                        st.session_state.inputs[key]["command"] = new_command
-                        st.session_state[expander_key] = True  # Force open when renaming
-                        st.rerun()
-
-                    def safe_index(lst, item):
-                        return lst.index(item) + 1 if item in lst else None
-
-                    func_name_list = list(st.session_state.function_results)
-                    prev_f_name = st.session_state.function_names[key]
-                    f_name = st.selectbox(
-                                label="function",
-                                options=[None] + func_name_list,
-                                index=safe_index(func_name_list, st.session_state.function_names[key]),
-                                key=f"function_{key}",
-                                help="Function called by the agent"
-                            )
-
-                    if f_name != prev_f_name:
-                        st.session_state.function_names[key] = f_name
-                        if st.session_state.function_results:
-                            if st.session_state.function_names[key] is None:
-                                st.session_state.inputs[key]["function"] = {}
-                                st.session_state.inputs[key]["class"] = ''
-                            else:
-                                st.session_state.inputs[key]["function"] = st.session_state.function_results[st.session_state.function_names[key]]['function']
-                                st.session_state.inputs[key]["class"] = st.session_state.function_results[st.session_state.function_names[key]]['class']
-                        # st.session_state[expander_key] = True  # Force open when renaming
-                        st.rerun()
-
-                # Expander for each input (contains "llm_config")
-                with st.expander(f"LLM for '{st.session_state.inputs[key]['name'] or 'Node'}'"):
-                    llm_model = st.selectbox(label="Model",
-                                options=list(LLM_MODEL_DICT.keys()),
-                                # index=list(LLM_MODEL_DICT.values()).index(st.session_state.inputs[key]['llm_config']['model_name']),
-                                index=list(LLM_MODEL_DICT.keys()).index(st.session_state.inputs[key]['llm_config']['model_name']),
-                                key=f"model_name_{key}",
-                                help='Large langauge model'
-                                )
-                    temperature = st.slider("Temperature", 0.0, 1.0, st.session_state.inputs[key]['llm_config']['temperature'],
-                                            key=f"temperature_{key}",
-                                            help='High for creativity, low for precision.')
-
-                    # if LLM_MODEL_DICT[llm_model] != st.session_state.inputs[key]['llm_config']['model_name'] or temperature != st.session_state.inputs[key]['llm_config']['temperature']:
-                    if llm_model != st.session_state.inputs[key]['llm_config']['model_name'] or temperature != st.session_state.inputs[key]['llm_config']['temperature']:
-                        # st.session_state.inputs[key]['llm_config']['model_name'] = LLM_MODEL_DICT[llm_model]
-                        st.session_state.inputs[key]['llm_config']['model_name'] = llm_model
-                        st.session_state.inputs[key]['llm_config']['temperature'] = temperature
-                        st.rerun()
+                        st.button("❌", key=f"remove_{key}", on_click=remove_input, args=(key,))
 
-                st.divider()
+                agent_details(key)
 
-            # Allow manual collapsing
-            if not expander:  # If user collapses manually
-                st.session_state[expander_key] = False
+                st.divider()
 
             # Buttons for adding inputs and submitting values
             left, right = st.columns([1, 1])
             with left:
                 st.button("➕ Add Input", on_click=add_input)
             with right:
-                if st.button("❌ Remove Last Input", key="remove_last"):
-                    to_remove = input_keys[-1]
-
-            # Remove input field immediately if button was pressed
-            if to_remove is not None:
-                remove_input(to_remove)
-
-            # Trigger rerun if filters changed
-            if filters_changed:
-                st.rerun()
-
-            new_tools = replace_strings_in_nested_dict(st.session_state.inputs, st.session_state.sub_dict)
-
-            data = {
-                "llm_config": {
-                    "model_name": st.session_state.llm_model,
-                    "temperature": st.session_state.temperature,
-                },
-                "tools": [i for i in new_tools.values() if i['name'] != '']
-            }
-
-            data = remove_empty_values(data)
-
-            # Convert dictionary to HOCON config
-            config = ConfigFactory.from_dict(data)
-
-            # Convert to HOCON format and write to file
-            hocon_str = HOCONConverter.convert(config, "hocon")
-
-            filename = st.text_input("Enter agent network name", st.session_state.network_file_name)
-            if filename != st.session_state.network_file_name:
-                st.session_state.network_file_name = filename
-                st.rerun()
-
-            disabled = any(list(st.session_state.errors.values()) + list(st.session_state.function_errors.values()))
-
-            st.download_button(
-                label="💾 Download HOCON File",
-                data=hocon_str,
-                file_name=st.session_state.network_file_name,
-                mime="text/plain",
-                disabled=disabled
-            )
+                st.button("❌ Remove Last Input", key="remove_last", on_click=remove_input, args=(input_keys[-1],))
 
-            if disabled:
-                st.error('🛠️ Please fix the error before downloading.')
+            network_export()
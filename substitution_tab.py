@@ -1,72 +1,114 @@
 import streamlit as st
 
-from pyhocon import ConfigFactory, HOCONConverter
+from diagnostics import rerun
+from export_jobs import export_controls, refresh_stale_downloads
+from hocon_core import (LRUCache, build_sub_dict, load_vars_config, new_var, parse_file_bytes, substitution_cycles,
+                        write_text)
 
+RECENT_UPLOADS = 32  # Far more than the three uploaders can hold at once
+
+
+def update_sub_dict():
+    st.session_state.sub_dict = st.session_state.revisions.derive(
+        "sub_dict", ("vars",), lambda: build_sub_dict(st.session_state.user_vars))
+
+
+def sub_dict_cycles():
+    return st.session_state.revisions.derive(
+        "sub_dict_cycles", ("vars",), lambda: substitution_cycles(st.session_state.sub_dict))
+
+
+# Function to add a new input box
+def add_var():
+    new_key = max(st.session_state.user_vars.keys(), default=-1) + 1
+    st.session_state.user_vars[new_key] = new_var()
+    st.session_state.revisions.touch("vars", new_key)
+
+
+# Function to remove a specific input box
+def remove_var(key):
+    if len(st.session_state.user_vars) >= 1:
+        del st.session_state.user_vars[key]
+        st.session_state.revisions.touch("vars", key)
+        update_sub_dict()
+
+
+def set_var_field(key, field, widget_key):
+    st.session_state.user_vars[key][field] = st.session_state[widget_key]
+    st.session_state.revisions.touch("vars", key)
+    update_sub_dict()
+
+
+@st.fragment
+def var_row(key):
+    """One key/value pair."""
+    user_var = st.session_state.user_vars.get(key)
+    if user_var is None:
+        return
+    refresh_stale_downloads()
+    if sub_dict_cycles() != st.session_state.shown_cycles:  # The warning above the rows is out of date
+        rerun()
+
+    st.text_input("Key", value=user_var["var"], key=f"var_{key}", help='Key or variable name',
+                  on_change=set_var_field, args=(key, "var", f"var_{key}"))
+    st.text_area(
+        label="Value",
+        value=user_var["sub_value"],
+        key=f"sub_{key}",
+        help="Value for substition",
+        on_change=set_var_field, args=(key, "sub_value", f"sub_{key}"),
+    )
+
+
+def set_key_value_file_name():
+    st.session_state.key_value_file_name = st.session_state.key_value_file_name_input
 
-def substitution_tab_content():
 
-    # Function to add a new input box
-    def add_var():
-        new_key = max(st.session_state.user_vars.keys(), default=-1) + 1
-        st.session_state.user_vars[new_key] = {
-            "var": "",
-            "sub_value": "",
-        }
-
-    # Function to remove a specific input box
-    def remove_var(key):
-        if len(st.session_state.user_vars) >= 1:
-            del st.session_state.user_vars[key]
-            update_sub_dict()
-            st.rerun()  # Forces immediate UI update
-
-    def update_sub_dict():
-        st.session_state.sub_dict = {
-            v['var']: v['sub_value']
-            for v in st.session_state.user_vars.values()
-            if v['var'] and v['sub_value']
-        }
+def key_value_snapshot(output_format):
+    sub_dict = st.session_state.sub_dict  # Replaced, never edited in place
+    return lambda: write_text(sub_dict, output_format)
+
+
+@st.fragment
+def key_value_export():
+    """Build the key/value file on the export worker only when asked."""
+    st.text_input("Enter filename", st.session_state.key_value_file_name,
+                  key="key_value_file_name_input", on_change=set_key_value_file_name)
+
+    # Converted again only after a variable changed
+    export_controls("key_value", ("vars",),
+                    "📄 Prepare Key/Value file", "💾 Download Key/Value file",
+                    st.session_state.key_value_file_name, key_value_snapshot)
+
+
+def substitution_tab_content():
 
     # Initialize a dictionary in session state to store user-defined variables
     if "user_vars" not in st.session_state:
         st.session_state.user_vars = {}
-        st.session_state.existing_files = []
+        st.session_state.existing_files = LRUCache(maxsize=RECENT_UPLOADS)  # Ids of the uploads already loaded
         st.session_state.sub_dict = {}
         st.session_state.key_value_file_name = "key_value.hocon"
 
     st.title("Define Your Variables")
     st.markdown("- Use **\\${key}** or **\\$key** to substitute for value.")
     st.write("- If there are duplicated keys, the bottom one will override the top one.")
+    st.write("- Values may use other keys; they are expanded before the network is.")
 
-    input_keys = list(st.session_state.user_vars.keys())  # Store keys to avoid modifying while iterating
+    st.session_state.shown_cycles = sub_dict_cycles()
+    for cycle in st.session_state.shown_cycles:
+        names = ", ".join(f"${{{key}}}" for key in cycle)
+        st.error(f"Circular reference between {names}. These references are left as written.")
 
-    to_remove = None  # Store keyf to remove
+    input_keys = list(st.session_state.user_vars.keys())  # Store keys to avoid modifying while iterating
 
     for key in input_keys:
         cols = st.columns([4, 1])
         with cols[0]:
-            prev_key = st.session_state.user_vars[key]["var"]
-            new_key = st.text_input("Key", value=st.session_state.user_vars[key]["var"], key=f"var_{key}", help='Key or variable name')
-            if new_key != prev_key:
-                st.session_state.user_vars[key]["var"] = new_key
-                update_sub_dict()
-                st.rerun()
-
-            prev_value = st.session_state.user_vars[key]["sub_value"]
-            new_value = st.text_area(
-                label="Value",
-                value=st.session_state.user_vars[key]["sub_value"],
-                key=f"sub_{key}",
-                help="Value for substition"
-            )
-            if new_value != prev_value:
-                st.session_state.user_vars[key]["sub_value"] = new_value
-                update_sub_dict()
-                st.rerun()
+            var_row(key)
 
         with cols[1]:
-            if st.button("❌", key=f"remove_var_{key}"):
-                to_remove = key  # Mark for removal
+            st.button("❌", key=f"remove_var_{key}", on_click=remove_var, args=(key,))
 
         st.divider()
 
@@ -87,42 +129,14 @@ def substitution_tab_content():
 
                 try:
                     # Attempt to load as a HOCON or CONF file
-                    if uploaded_file.name.endswith(".hocon") or uploaded_file.name.endswith(".conf") or uploaded_file.name.endswith(".json"):
-                        config = ConfigFactory.parse_string(uploaded_file.getvalue().decode("utf-8"))
-                    else:
-                        st.error("Unsupported file format!")
-
+                    config = parse_file_bytes(uploaded_file.name, uploaded_file.getvalue())
                 except Exception as e:
                     st.error(f"An error occurred while loading the file: {e}")
-
-                for key_var, sub_value in config.items():
-                    add_var()
-                    st.session_state.user_vars[list(st.session_state.user_vars.keys())[-1]]['var'] = key_var
-                    st.session_state.user_vars[list(st.session_state.user_vars.keys())[-1]]['sub_value'] = sub_value
-                update_sub_dict()
-                st.session_state.existing_files.append(file_id)
-                st.rerun()
-
-    # Remove input field immediately if button was pressed
-    if to_remove is not None:
-        remove_var(to_remove)
-
-    # Create dict for substitution
-    # st.session_state.sub_dict = {v['var']: v['sub_value'] for v in st.session_state.user_vars.values() if v['var'] and v['sub_value']}
-
-    # Convert dictionary to HOCON config
-    config = ConfigFactory.from_dict(st.session_state.sub_dict)
-
-    # Convert to HOCON format and write to file
-    hocon_str = HOCONConverter.convert(config, "hocon")
-
-    filename = st.text_input("Enter filename", st.session_state.key_value_file_name)
-    if filename != st.session_state.key_value_file_name:
-        st.session_state.key_value_file_name = filename
-
-    st.download_button(
-        label="💾 Download Key/Value as HOCON File",
-        data=hocon_str,
-        file_name=st.session_state.key_value_file_name,
-        mime="text/plain",
-    )
+                else:
+                    st.session_state.user_vars = load_vars_config(config, st.session_state.user_vars)
+                    st.session_state.revisions.touch("vars")
+                    update_sub_dict()
+                st.session_state.existing_files.put(file_id, True)
+                rerun()
+
+    key_value_export()
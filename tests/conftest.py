@@ -0,0 +1,18 @@
+import os
+import sys
+
+import pytest
+
+# The app modules live at the top of the repository, next to hocon_core
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import autosave  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def session_db(tmp_path, monkeypatch):
+    """Autosave every app run to a database of its own."""
+    monkeypatch.setattr(autosave, "AUTOSAVE_PATH", str(tmp_path / "sessions.db"))
+    autosave.get_session_store.clear()
+    yield
+    autosave.get_session_store.clear()
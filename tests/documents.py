@@ -0,0 +1,47 @@
+"""Seeded random documents for the differential tests against pyhocon, json and yaml."""
+import random
+
+KEYS = ['name', 'tools', 'llm_config', 'a_b', 'x-y', 'k1', '1', 'true', 'null', 'inf', 'über', 'Yes',
+        'a.b', 'with space', '$x', '"q"', 'a:b', '#c']
+CHARACTERS = ['a', 'b', ' ', '\n', '"', '\\', '$', '{', '}', '[', ']', '\t', '.', '=', ':', '#', 'é', '\r', '/',
+              '*', '-', '1', 'e', '\x01', "'", ',', '✓']
+STRINGS = ['', 'hello world', 'multi\nline', '\n', 'yes', 'null', ' lead', 'trail ', 'a: b', '- item', '1.5',
+           'line\n\n', 'end\n', 'a\n  indented\nb', '${var}', 'del\x7f', '~']
+SCALARS = [None, True, False, 0, 1, -3, 0.5, 1.0, -2.5, 1e20, 2.5e-7]
+
+
+def random_documents(seed, count, max_depth=3):
+    rng = random.Random(seed)
+
+    def text():
+        if rng.random() < 0.5:
+            return rng.choice(STRINGS)
+        return ''.join(rng.choice(CHARACTERS) for _ in range(rng.randint(0, 8)))
+
+    def value(depth):
+        r = rng.random()
+        if depth < max_depth and r < 0.2:
+            return {rng.choice(KEYS): value(depth + 1) for _ in range(rng.randint(0, 3))}
+        if depth < max_depth and r < 0.35:
+            return [value(depth + 1) for _ in range(rng.randint(0, 3))]
+        return text() if r < 0.75 else rng.choice(SCALARS)
+
+    for _ in range(count):
+        yield {rng.choice(KEYS): value(0) for _ in range(rng.randint(1, 4))}
+
+
+# Texts a hand edit could leave behind; the fast path must match pyhocon or step aside
+EDGE_CASE_TEXTS = [
+    'a = 1  ',
+    'a = 1  \n',
+    'a = -2.5e3 \t',
+    'a = true ',
+    'a = null  ',
+    'a = 1.5 \nb = 2',
+    'a = "x"  ',
+    'a {\n  b = 1 \n}',
+    'a {\n  b = false  \n} ',
+    'a = [\n  1 \n]',
+    'a = [\n  1\n] ',
+    'a = """x"""   ',
+]
@@ -0,0 +1,57 @@
+from hocon_core import Agent, AgentIndex
+
+
+def network(*agents):
+    return {key: Agent(name=name, tools=list(tools)) for key, (name, tools) in enumerate(agents)}
+
+
+def test_rename_updates_callers():
+    inputs = network(("front", ["billing"]), ("billing", []), ("audit", ["billing", "front"]))
+    index = AgentIndex(inputs)
+    index.rename(1, "payments")
+    assert inputs[0]["tools"] == ["payments"]
+    assert inputs[2]["tools"] == ["payments", "front"]
+    assert index.callers("payments") == {0, 2} and not index.callers("billing")
+    assert index.names() == ["front", "payments", "audit"]
+    assert "billing" not in index
+
+
+def test_rename_to_empty_drops_edges():
+    inputs = network(("front", ["billing"]), ("billing", ["billing"]))
+    index = AgentIndex(inputs)
+    index.rename(1, "")
+    assert inputs[0]["tools"] == [] and inputs[1]["tools"] == []
+    assert not index.callers("billing") and not index.callers("")
+    assert index.names() == ["front"]
+
+
+def test_remove_drops_edges():
+    inputs = network(("front", ["billing", "audit"]), ("billing", ["audit"]), ("audit", []))
+    index = AgentIndex(inputs)
+    index.remove(1)
+    assert 1 not in inputs
+    assert inputs[0]["tools"] == ["audit"]
+    assert index.callers("audit") == {0}
+    assert index.names() == ["front", "audit"]
+
+
+def test_set_tools_updates_reverse_edges():
+    inputs = network(("front", ["billing"]), ("billing", []), ("audit", []))
+    index = AgentIndex(inputs)
+    index.set_tools(0, ["audit"])
+    assert inputs[0]["tools"] == ["audit"]
+    assert not index.callers("billing") and index.callers("audit") == {0}
+
+
+def test_duplicate_names_keep_their_callers():
+    inputs = network(("front", ["billing"]), ("billing", []), ("billing", []))
+    index = AgentIndex(inputs)
+    assert index.names() == ["front", "billing"]
+
+    index.rename(1, "payments")  # Another agent is still called billing
+    assert inputs[0]["tools"] == ["billing"]
+    assert index.names() == ["front", "payments", "billing"]
+
+    index.remove(2)  # The last billing is gone
+    assert inputs[0]["tools"] == []
+    assert "billing" not in index and index.names() == ["front", "payments"]
@@ -0,0 +1,29 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hocon_editor.py")
+
+
+def app():
+    return AppTest.from_file(APP, default_timeout=60)
+
+
+def test_restored_function_takes_new_params():
+    at = app()
+    at.run()
+    at.button(key="add_function").click().run()
+    at.text_input(key="func_name_0").input("lookup").run()
+    at.button(key="add_param_0").click().run()
+    assert not at.exception
+    session = at.query_params["session"]
+
+    restored = app()
+    restored.query_params["session"] = session
+    restored.run()
+    properties = restored.session_state.functions[0]["parameters"]["properties"]
+    assert list(properties) == [0]
+
+    restored.button(key="add_param_0").click().run()
+    assert not restored.exception
+    assert list(restored.session_state.functions[0]["parameters"]["properties"]) == [0, 1]
@@ -0,0 +1,48 @@
+import os
+
+from streamlit.testing.v1 import AppTest
+
+from hocon_core import LLM_MODEL_NAMES, new_agent
+
+APP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "hocon_editor.py")
+
+
+def editor_with_agents(temperatures):
+    at = AppTest.from_file(APP, default_timeout=60)
+    at.run()
+    [button for button in at.button if button.label == "Create new"][0].click().run()
+    inputs = {}
+    for key, temperature in enumerate(temperatures):
+        inputs[key] = new_agent()
+        inputs[key]["name"] = f"agent{key}"
+        inputs[key]["llm_config"]["temperature"] = temperature
+    at.session_state["inputs"] = inputs
+    at.session_state["function_names"] = {key: "" for key in inputs}
+    at.session_state["errors"] = {}
+    at.run()
+    return at
+
+
+def apply(at):
+    [button for button in at.sidebar.button if button.label.startswith("Apply")][0].click().run()
+    assert not at.exception
+
+
+def test_set_model_keeps_temperatures():
+    at = editor_with_agents([0.1, 0.7])
+    at.sidebar.selectbox(key="bulk_model").select(LLM_MODEL_NAMES[3])
+    apply(at)
+    configs = [agent["llm_config"] for agent in at.session_state.inputs.values()]
+    assert [config["model_name"] for config in configs] == [LLM_MODEL_NAMES[3]] * 2
+    assert [config["temperature"] for config in configs] == [0.1, 0.7]
+
+
+def test_set_temperature_keeps_models():
+    at = editor_with_agents([0.1, 0.7])
+    at.session_state.inputs[1]["llm_config"]["model_name"] = LLM_MODEL_NAMES[2]
+    at.sidebar.checkbox(key="bulk_keep_temperature").uncheck()
+    at.sidebar.slider(key="bulk_temperature").set_value(0.9)
+    apply(at)
+    configs = [agent["llm_config"] for agent in at.session_state.inputs.values()]
+    assert [config["temperature"] for config in configs] == [0.9, 0.9]
+    assert configs[1]["model_name"] == LLM_MODEL_NAMES[2]
@@ -0,0 +1,19 @@
+from hocon_core import LRUCache
+
+
+def test_least_recently_used_key_is_evicted():
+    cache = LRUCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    assert cache.get("a") == 1
+    cache.put("c", 3)
+    assert cache.get("b") is None and cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_membership_check_keeps_the_key():
+    cache = LRUCache(maxsize=2)
+    cache.put("upload", True)
+    for other in range(10):
+        assert "upload" in cache
+        cache.put(other, True)
+    assert "upload" in cache and len(cache) == 2
@@ -0,0 +1,43 @@
+from hocon_core import aggregate_id, aggregate_parent, drilldown_view
+
+NODES = ("front", "a", "b", "a1", "a2", "a11", "b1", "lonely")
+EDGES = (("front", "a"), ("front", "b"), ("a", "a1"), ("a", "a2"), ("a1", "a11"), ("b", "b1"), ("a11", "front"))
+
+
+def shown(visible):
+    return {node_id: hidden for node_id, _, hidden in visible}
+
+
+def test_collapsed_subtrees_count_their_descendants():
+    visible, edges, unreachable = drilldown_view(NODES, EDGES, "front", depth=1)
+    assert shown(visible) == {"front": 0, "a": 0, "b": 0, aggregate_id("a"): 3, aggregate_id("b"): 1}
+    assert ("front", "a") in edges and ("a", aggregate_id("a")) in edges
+    assert unreachable == 1
+    assert dict((node_id, label) for node_id, label, _ in visible)[aggregate_id("a")] == "+3"
+
+
+def test_depth_zero_collapses_everything_below_the_root():
+    visible, edges, _ = drilldown_view(NODES, EDGES, "front", depth=0)
+    assert shown(visible) == {"front": 0, aggregate_id("front"): 6}
+    assert edges == [("front", aggregate_id("front"))]
+
+
+def test_expanding_a_collapsed_subtree():
+    visible, edges, _ = drilldown_view(NODES, EDGES, "front", depth=1, expanded=frozenset({"a"}))
+    assert shown(visible) == {"front": 0, "a": 0, "b": 0, "a1": 0, "a2": 0,
+                              aggregate_id("a1"): 1, aggregate_id("b"): 1}
+    assert ("a", "a1") in edges and ("a1", aggregate_id("a1")) in edges
+    assert ("a11", "front") not in edges  # a11 is still hidden
+
+
+def test_shared_descendants_are_counted_once():
+    nodes = ("front", "a", "b", "c")
+    edges = (("front", "a"), ("front", "b"), ("a", "c"), ("b", "c"))
+    visible, _, _ = drilldown_view(nodes, edges, "front", depth=0)
+    assert shown(visible)[aggregate_id("front")] == 3
+
+
+def test_unknown_root_and_aggregate_ids():
+    assert drilldown_view(NODES, EDGES, "nobody", depth=2) == ([], [], len(NODES))
+    assert aggregate_parent(aggregate_id("a")) == "a"
+    assert aggregate_parent("a") is None and aggregate_parent(None) is None
@@ -0,0 +1,62 @@
+import pytest
+from pyhocon import ConfigFactory, HOCONConverter
+from pyhocon.config_tree import NoneValue
+
+from documents import EDGE_CASE_TEXTS, random_documents
+from hocon_core import UnsupportedHocon, parse_fast, synthetic_workload, to_hocon
+
+
+def plain(value):
+    """Nested values with their types, so 1 and 1.0 or True and 1 do not compare equal."""
+    if isinstance(value, dict):
+        return {key: plain(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [plain(item) for item in value]
+    if value is None or isinstance(value, NoneValue):
+        return None
+    return type(value).__name__, value
+
+
+def test_editor_export_takes_the_fast_path():
+    text = to_hocon(synthetic_workload(20)["network"])
+    assert plain(parse_fast(text)) == plain(ConfigFactory.parse_string(text))
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_matches_pyhocon_on_written_documents(seed):
+    parsed = 0
+    for data in random_documents(seed, 100):
+        try:
+            text = HOCONConverter.convert(ConfigFactory.from_dict(data), "hocon")
+            expected = ConfigFactory.parse_string(text)
+        except Exception:  # Documents pyhocon cannot write or read back say nothing about the fast path
+            continue
+        try:
+            result = parse_fast(text)
+        except UnsupportedHocon:
+            continue
+        assert plain(result) == plain(expected), text
+        parsed += 1
+    assert parsed > 30  # Most documents stay in the fast-path subset
+
+
+@pytest.mark.parametrize("text", EDGE_CASE_TEXTS)
+def test_matches_pyhocon_or_falls_back(text):
+    try:
+        result = parse_fast(text)
+    except UnsupportedHocon:
+        return
+    assert plain(result) == plain(ConfigFactory.parse_string(text))
+
+
+@pytest.mark.parametrize("text", [
+    'include "other.conf"',
+    'a = ${b}',
+    'a = 1 // comment',
+    'a.b = 1',
+    'a = 1\na = 2',
+    'a = [1, 2]',
+])
+def test_rejects_text_outside_the_subset(text):
+    with pytest.raises(UnsupportedHocon):
+        parse_fast(text)
@@ -0,0 +1,45 @@
+from pyhocon import ConfigFactory
+
+from hocon_core import FunctionIndex, function_fingerprint, function_shape, load_network_config
+
+SPEC = {"description": "Look up an order.", "parameters": {
+    "type": "object", "properties": {"id": {"type": "string", "description": "Order id"}}, "required": ["id"]}}
+
+
+def test_fingerprint_ignores_key_order():
+    reordered = {"parameters": {"required": ["id"], "properties": {"id": {"description": "Order id", "type": "string"}},
+                                "type": "object"}, "description": "Look up an order."}
+    assert function_fingerprint(reordered) == function_fingerprint(SPEC)
+    assert function_fingerprint(dict(SPEC, description="Look up a refund.")) != function_fingerprint(SPEC)
+
+
+def test_shape_ignores_case_whitespace_and_trailing_period():
+    near = dict(SPEC, description="  look up   an ORDER")
+    assert function_fingerprint(near) != function_fingerprint(SPEC)
+    assert function_shape(near) == function_shape(SPEC)
+
+
+def test_identical_specs_share_a_key_and_near_ones_are_merge_candidates():
+    index = FunctionIndex()
+    assert index.add(0, SPEC) is None
+    assert index.add(1, dict(reversed(list(SPEC.items())))) == 0
+    assert index.add(2, dict(SPEC, description="look up an order")) is None
+    assert index.add(3, dict(SPEC, description="Cancel an order.")) is None
+    assert index.add(4, dict(SPEC, description="LOOK UP AN ORDER.")) is None
+    assert len(index) == 4
+    assert index.merge_candidates == [(0, 2), (0, 4)]
+
+
+def test_loaded_network_shares_identical_functions():
+    config = ConfigFactory.parse_string("""
+        tools = [
+          {name = a, function {description = "Look up", parameters {type = object, properties {}}}}
+          {name = b, function {parameters {properties {}, type = object}, description = "Look up"}}
+          {name = c, function {description = "look up.", parameters {type = object, properties {}}}}
+        ]
+    """)
+    state = load_network_config(config)
+    assert "existing_functions" not in state
+    assert state["function_names"][0] == state["function_names"][1] != state["function_names"][2]
+    assert len(state["functions"]) == 2
+    assert state["merge_candidates"] == [(state["function_names"][0], state["function_names"][2])]
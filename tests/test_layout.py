@@ -0,0 +1,47 @@
+import pytest
+
+from hocon_core import Agent, compute_layout, force_layout, layered_layout, network_topology
+
+
+def test_topology_skips_unnamed_agents_and_unknown_connections():
+    inputs = {0: Agent(name="front", tools=["a", "ghost"]), 1: Agent(name="", tools=["front"]), 2: Agent(name="a")}
+    assert network_topology(inputs) == (("front", "a"), (("front", "a"),))
+
+
+def test_frontman_is_in_the_top_layer():
+    nodes = ("front", "a", "b", "c")
+    edges = (("a", "front"), ("b", "a"), ("front", "c"), ("c", "b"))
+    coordinates = layered_layout(nodes, edges)
+    assert coordinates["front"][1] == 0
+    assert all(y > 0 for node, (x, y) in coordinates.items() if node != "front")
+    # An agent that only calls the frontman is not reached from it
+    assert layered_layout(("front", "caller"), (("caller", "front"),))["front"][1] == 0
+
+
+def test_cycles_are_broken():
+    nodes = ("front", "a", "b", "c")
+    edges = (("front", "a"), ("a", "b"), ("b", "c"), ("c", "a"), ("b", "b"))
+    coordinates = layered_layout(nodes, edges, layer_gap=100)
+    assert [coordinates[node][1] for node in nodes] == [0, 100, 200, 300]
+    assert len(set(coordinates.values())) == len(nodes)
+
+
+def test_layers_are_centred_and_ordered_by_their_parents():
+    nodes = ("front", "a", "b", "a1", "b1")
+    edges = (("front", "a"), ("front", "b"), ("b", "b1"), ("a", "a1"))
+    coordinates = layered_layout(nodes, edges, layer_gap=100, node_gap=50)
+    assert coordinates["front"] == (0, 0)
+    assert {coordinates["a"], coordinates["b"]} == {(-25, 100), (25, 100)}
+    assert (coordinates["a1"][0] < coordinates["b1"][0]) == (coordinates["a"][0] < coordinates["b"][0])
+
+
+def test_coordinates_are_fixed_per_topology():
+    nodes = ("front", "a", "b")
+    edges = (("front", "a"), ("front", "b"))
+    for mode in ("layered", "force"):
+        first = compute_layout(list(nodes), list(edges), mode)
+        assert compute_layout(nodes, edges, mode) is first  # Computed once per topology
+    assert force_layout(nodes, edges) == force_layout(nodes, edges)
+    assert layered_layout((), ()) == {} and force_layout((), ()) == {}
+    with pytest.raises(ValueError):
+        compute_layout(nodes, edges, "circle")
@@ -0,0 +1,22 @@
+from pyhocon import ConfigFactory
+
+from hocon_core import build_network_data, load_network_config, validate_network
+
+NETWORK = """
+tools = [
+  {name = "router", instructions = "Send billing questions on", tools = ["billing"]}
+  {name = "billing", instructions = "Answer"}
+]
+"""
+
+
+def test_connections_use_the_same_references_as_names():
+    sub_dict = {"team": "billing"}
+    state = load_network_config(ConfigFactory.parse_string(NETWORK), sub_dict)
+    inputs = state["inputs"]
+    assert inputs[1]["name"] == "${team}"
+    assert inputs[0]["tools"] == ["${team}"]
+    assert not any(validate_network(inputs).values())
+
+    data = build_network_data(inputs, state["llm_model"], state["temperature"], sub_dict)
+    assert [tool.get("tools") for tool in data["tools"]] == [["billing"], None]
@@ -0,0 +1,29 @@
+from pyhocon import ConfigFactory
+
+from hocon_core import Agent, Function, load_function_config, load_vars_config
+
+LONG = "Looks up the order in the billing system and returns its status. " * 5
+
+
+def test_loaded_texts_are_shared():
+    functions = load_function_config(ConfigFactory.parse_string(f"""
+        first.function {{description = "{LONG}", parameters.properties.id {{type = string, description = "{LONG}"}}}}
+        second.function {{description = "{LONG}", parameters.properties.id {{type = string, description = "{LONG}"}}}}
+    """))
+    first, second = (func["parameters"]["properties"][0]["description"] for func in functions.values())
+    assert first == LONG and first is second
+    assert functions[0]["description"] is functions[1]["description"] is first
+
+    user_vars = load_vars_config(ConfigFactory.parse_string(f'a = "{LONG}"\nb = "{LONG}"'))
+    assert user_vars[0]["sub_value"] is user_vars[1]["sub_value"] is first
+
+
+def test_agent_text_is_shared():
+    assert Agent(instructions=LONG[:-1] + " ")["instructions"] is Agent(instructions=LONG)["instructions"]
+
+
+def test_function_round_trip():
+    func = load_function_config(ConfigFactory.parse_string(
+        'f.function {description = d, parameters.properties.x {type = int, description = p}}'))[0]
+    restored = Function.from_dict(func.to_dict())
+    assert restored == func and list(restored["parameters"]["properties"]) == [0]
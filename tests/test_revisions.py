@@ -0,0 +1,80 @@
+from hocon_core import RevisionStore
+
+
+def counting(calls):
+    def compute(key, value):
+        calls.append(key)
+        return value.upper()
+    return compute
+
+
+def test_unchanged_entities_reuse_their_results():
+    revisions, calls = RevisionStore(), []
+    items = {0: "a", 1: "b", 2: "c"}
+    assert revisions.derive_each("upper", "agents", items, counting(calls)) == {0: "A", 1: "B", 2: "C"}
+
+    revisions.touch("agents", 1)
+    items[1] = "x"
+    calls.clear()
+    assert revisions.derive_each("upper", "agents", items, counting(calls)) == {0: "A", 1: "X", 2: "C"}
+    assert calls == [1]
+
+
+def test_touching_a_whole_kind_invalidates_every_entity():
+    revisions, calls = RevisionStore(), []
+    items = {0: "a", 1: "b"}
+    revisions.touch("agents", 0)
+    revisions.derive_each("upper", "agents", items, counting(calls))
+    before = {key: revisions.entity_revision("agents", key) for key in items}
+
+    revisions.touch("agents")
+    calls.clear()
+    revisions.derive_each("upper", "agents", items, counting(calls))
+    assert sorted(calls) == [0, 1]
+    assert all(revisions.entity_revision("agents", key) > before[key] for key in items)
+
+
+def test_other_kinds_are_not_invalidated():
+    revisions, calls = RevisionStore(), []
+    revisions.derive_each("upper", "agents", {0: "a"}, counting(calls))
+    revisions.touch("functions")
+    revisions.touch("vars", 0)
+    calls.clear()
+    revisions.derive_each("upper", "agents", {0: "a"}, counting(calls))
+    assert calls == []
+
+
+def test_removed_entities_are_dropped():
+    revisions, calls = RevisionStore(), []
+    revisions.derive_each("upper", "agents", {0: "a", 1: "b"}, counting(calls))
+    assert revisions.derive_each("upper", "agents", {0: "a"}, counting(calls)) == {0: "A"}
+    calls.clear()
+    revisions.derive_each("upper", "agents", {0: "a", 1: "b"}, counting(calls))
+    assert calls == [1]
+
+
+def test_derive_recomputes_only_after_its_kinds_change():
+    revisions, calls = RevisionStore(), []
+
+    def compute():
+        calls.append(1)
+        return len(calls)
+
+    assert revisions.derive("view", ("agents", "vars"), compute) == 1
+    assert revisions.derive("view", ("agents", "vars"), compute) == 1
+    revisions.touch("functions")
+    assert revisions.peek("view", ("agents", "vars")) == 1
+    revisions.touch("vars", 3)
+    assert revisions.peek("view", ("agents", "vars")) is None
+    assert revisions.derive("view", ("agents", "vars"), compute) == 2
+
+    revisions.compact()
+    assert revisions.peek("view", ("agents", "vars")) is None
+
+
+def test_on_touch_hook():
+    revisions, seen = RevisionStore(), []
+    revisions.on_touch = lambda kind, keys: seen.append((kind, keys))
+    revisions.touch("agents", 1, 2)
+    revisions.touch("vars")
+    assert seen == [("agents", (1, 2)), ("vars", ())]
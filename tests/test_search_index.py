@@ -0,0 +1,64 @@
+from hocon_core import Agent, RevisionStore, SearchIndex, Var
+
+
+def agents(*specs):
+    return {key: Agent(name=name, instructions=instructions) for key, (name, instructions) in enumerate(specs)}
+
+
+def indexed(inputs, user_vars=None):
+    revisions, index = RevisionStore(), SearchIndex()
+    index.sync(revisions, "agents", inputs)
+    index.sync(revisions, "vars", user_vars or {})
+    return revisions, index
+
+
+def test_names_come_before_other_fields():
+    _, index = indexed(agents(("router", "Send billing questions on"), ("billing", "Answer invoices")))
+    assert index.search("billing") == [("agents", 1, "name"), ("agents", 0, "instructions")]
+    assert index.search("BILL") == index.search("billing")
+
+
+def test_phrase_matches_come_first():
+    inputs = agents(("a", "refund the order now"), ("b", "order a refund"), ("c", "refund order"))
+    _, index = indexed(inputs)
+    results = index.search("refund order")
+    assert results[0] == ("agents", 2, "instructions")  # The only one with the words as a phrase
+    assert set(results[1:]) == {("agents", 0, "instructions"), ("agents", 1, "instructions")}
+    assert index.search("refund order", limit=1) == [("agents", 2, "instructions")]
+
+
+def test_short_terms():
+    _, index = indexed(agents(("ab", "Costs $5 or 5 €"), ("x", "nothing")), {0: Var("price", "${cost}")})
+    assert index.search("ab") == [("agents", 0, "name")]
+    assert index.search("5") == [("agents", 0, "instructions")]
+    assert index.search("$") == [("agents", 0, "instructions"), ("vars", 0, "value")]
+    assert index.search("€") == [("agents", 0, "instructions")]
+    assert index.search("zz") == []
+
+
+def test_sync_reindexes_changed_entities_only():
+    inputs = agents(("front", "hello"), ("helper", "world"))
+    revisions, index = indexed(inputs)
+    inputs[1]["instructions"] = "planet"
+    index.sync(revisions, "agents", inputs)
+    assert index.search("planet") == []  # Not touched, so not re-indexed
+
+    revisions.touch("agents", 1)
+    index.sync(revisions, "agents", inputs)
+    assert index.search("planet") == [("agents", 1, "instructions")]
+    assert index.search("world") == []
+
+    del inputs[0]
+    revisions.touch("agents", 0)
+    index.sync(revisions, "agents", inputs)
+    assert index.search("hello") == [] and index.search("front") == []
+
+
+def test_remove_and_snippet():
+    _, index = indexed(agents(("front", "Greet the user. " * 5 + "Then route the question to billing.")))
+    document = ("agents", 0, "instructions")
+    assert index.snippet(document, "route the", width=30).startswith("…")
+    assert "route the question" in index.snippet(document, "route the", width=30)
+    index.remove(document)
+    assert index.search("route") == [] and index.search("front") == [("agents", 0, "name")]
+    assert len(index) == 1  # Empty fields are not indexed
@@ -0,0 +1,39 @@
+from hocon_core import (LRUCache, build_network_data, load_network_config, parse_hocon, serialize_network,
+                        synthetic_workload, to_hocon)
+
+
+def loaded_network(agents=30):
+    workload = synthetic_workload(agents)
+    state = load_network_config(parse_hocon(to_hocon(workload["network"])), workload["vars"])
+    return state, workload["vars"]
+
+
+def full_export(state, sub_dict):
+    return to_hocon(build_network_data(state["inputs"], state["llm_model"], state["temperature"], sub_dict))
+
+
+def test_matches_full_export_before_and_after_an_edit():
+    state, sub_dict = loaded_network()
+    cache = LRUCache()
+    args = state["inputs"], state["llm_model"], state["temperature"], sub_dict
+    assert serialize_network(*args, cache=cache) == full_export(state, sub_dict)
+    fragments = len(cache)
+
+    edited = state["inputs"][5]
+    edited["instructions"] += " Reply with ${var_1}."
+    edited["llm_config"]["temperature"] = 0.1
+    text = serialize_network(*args, cache=cache)
+    assert text == full_export(state, sub_dict)
+    assert len(cache) == fragments + 1  # Only the edited agent was serialized again
+
+
+def test_unnamed_agents_and_changed_variables():
+    state, sub_dict = loaded_network(10)
+    cache = LRUCache()
+    state["inputs"][3]["name"] = ""
+    args = state["inputs"], state["llm_model"], state["temperature"]
+    assert serialize_network(*args, sub_dict, cache=cache) == full_export(state, sub_dict)
+
+    changed = dict(sub_dict, var_0="A new value")
+    assert serialize_network(*args, changed, cache=cache) == full_export(state, changed)
+    assert serialize_network(*args, {}, cache=cache) == full_export(state, {})
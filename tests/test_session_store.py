@@ -0,0 +1,47 @@
+import sqlite3
+import time
+
+from hocon_core import SessionStore, fold_changes
+
+
+def saved_rows(path):
+    with sqlite3.connect(path) as connection:
+        return connection.execute("SELECT COUNT(*) FROM changes").fetchone()[0]
+
+
+def test_fold_changes():
+    rows = [("vars", None, '{"0": 1, "1": 2}'), ("vars", "0", None), ("vars", "2", "3"), ("network", None, '"n"')]
+    assert fold_changes(rows) == {"vars": {"1": 2, "2": 3}, "network": "n"}
+
+
+def test_load_does_not_wait_for_debounce(tmp_path):
+    store = SessionStore(str(tmp_path / "sessions.db"), debounce=30)
+    store.record("s", "vars", 0, {"var": "a"})
+    start = time.monotonic()
+    assert store.load("s") == {"vars": {"0": {"var": "a"}}}
+    assert time.monotonic() - start < 5
+
+
+def test_batch_is_written_while_edits_keep_coming(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    store = SessionStore(path, debounce=0.5, max_delay=0.3)
+    deadline = time.monotonic() + 2
+    while time.monotonic() < deadline and not saved_rows(path):
+        store.record("s", "vars", 0, {"var": "a"})
+        time.sleep(0.05)
+    assert saved_rows(path)
+
+
+def test_writer_survives_a_failed_write(tmp_path, monkeypatch):
+    store = SessionStore(str(tmp_path / "sessions.db"), debounce=0.01)
+    write = store._write
+
+    def fail_once(connection, batch):
+        monkeypatch.setattr(store, "_write", write)
+        raise sqlite3.OperationalError("disk I/O error")
+
+    monkeypatch.setattr(store, "_write", fail_once)
+    store.record("s", "vars", 0, {"var": "lost"})
+    store.flush()
+    store.record("s", "vars", 1, {"var": "kept"})
+    assert store.load("s") == {"vars": {"1": {"var": "kept"}}}
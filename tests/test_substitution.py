@@ -0,0 +1,84 @@
+from hocon_core import (BlobStore, ForwardSubstituter, ReverseSubstituter, build_sub_dict, load_vars_config,
+                        replace_strings_in_nested_dict, replace_value_with_key, resolve_sub_dict, sub_dict_version,
+                        substitution_cycles)
+
+
+def test_nested_values_are_expanded():
+    sub_dict = {"greet": "Hello ${name}", "name": "$first Doe", "first": "Bob", "other": "${missing}"}
+    assert resolve_sub_dict(sub_dict) == {
+        "greet": "Hello Bob Doe", "name": "Bob Doe", "first": "Bob", "other": "${missing}"}
+    assert replace_strings_in_nested_dict({"text": ["${greet}!"]}, sub_dict) == {"text": ["Hello Bob Doe!"]}
+
+
+def test_reverse_substitution_matches_expanded_values():
+    sub_dict = {"greet": "Hello ${name}", "name": "Bob"}
+    assert replace_value_with_key("Hello Bob, Bob", sub_dict) == "${greet}, ${name}"
+
+
+def test_cycle_through_several_branches():
+    sub_dict = {"a": "${b} ${c} ${d}", "b": "${a}", "c": "${a}", "d": "leaf", "e": "${b}"}
+    assert substitution_cycles(sub_dict) == [["a", "b", "c"]]
+    resolved = resolve_sub_dict(sub_dict)
+    assert resolved["a"] == "${b} ${c} leaf"
+    assert resolved["e"] == "${b}"
+
+
+def test_separate_cycles_and_self_reference():
+    sub_dict = {"x": "${x}", "a": "${b}", "b": "${a}", "c": "${d}", "d": "${c} ${a}", "ok": "fine"}
+    assert substitution_cycles(sub_dict) == [["x"], ["a", "b"], ["c", "d"]]
+    assert substitution_cycles({"ok": "fine", "uses": "${ok}"}) == []
+
+
+def test_build_sub_dict_skips_empty_rows():
+    user_vars = load_vars_config({"a": "1", "b": ""})
+    assert build_sub_dict(user_vars) == {"a": "1"}
+
+
+def test_escaped_dollars_in_values_are_kept():
+    sub_dict = {"y": "Y", "mixed": "pre ${y} $$ lit", "plain": "cost $$5", "cyclic": "${cyclic} $$"}
+    resolved = resolve_sub_dict(sub_dict)
+    assert resolved["mixed"] == "pre Y $$ lit"
+    assert resolved["plain"] == "cost $$5"
+    assert resolved["cyclic"] == "${cyclic} $$"
+    assert replace_strings_in_nested_dict("${mixed} / ${plain}", sub_dict) == "pre Y $$ lit / cost $$5"
+
+
+def test_reverse_prefers_the_longest_value_at_each_position():
+    substituter = ReverseSubstituter({"short": "abc", "long": "abcd", "other": "bcde"})
+    assert substituter("abcd abc abce xbcde") == "${long} ${short} ${short}e x${other}"
+    assert substituter("abcde") == "${long}e"  # Leftmost match wins over a longer one further right
+
+
+def test_reverse_escapes_regex_metacharacters():
+    substituter = ReverseSubstituter({"meta": "a.b*(c)?", "price": "$5 [x]", "path": "C:\\dir"})
+    assert substituter("a.b*(c)? axb*(c) $5 [x] C:\\dir") == "${meta} axb*(c) ${price} ${path}"
+
+
+def test_reverse_uses_the_first_key_of_a_shared_value():
+    assert ReverseSubstituter({"a": "same", "b": "same", "c": ""})("same") == "${a}"
+
+
+def test_reverse_with_many_values():
+    sub_dict = {f"k{i}": f"value {i}" for i in range(500)}
+    assert ReverseSubstituter(sub_dict)("value 12, value 120 and value 1") == "${k12}, ${k120} and ${k1}"
+
+
+def test_forward_results_are_reused_per_version():
+    substituter = ForwardSubstituter(blobs=BlobStore(min_size=100))
+    old, new = {"name": "Bob"}, {"name": "Ann"}
+    short, long = "Hi ${name}", "Hi ${name}. " + "x" * 100
+    for text in (short, long):
+        assert substituter.substitute(text, old, sub_dict_version(old)).startswith("Hi Bob")
+        # Same version: the memoized result is returned without substituting again
+        assert substituter.substitute(text, new, sub_dict_version(old)).startswith("Hi Bob")
+        assert substituter.substitute(text, new, sub_dict_version(new)).startswith("Hi Ann")
+    assert substituter.substitute("no references", new, "any") == "no references"
+
+
+def test_changed_variable_gives_a_new_version():
+    sub_dict = {"name": "Bob", "greet": "Hello"}
+    assert sub_dict_version(sub_dict) == sub_dict_version({"greet": "Hello", "name": "Bob"})
+    assert sub_dict_version(sub_dict) != sub_dict_version(dict(sub_dict, name="Ann"))
+    agent = {"instructions": "${greet} ${name}"}
+    assert replace_strings_in_nested_dict(agent, sub_dict) == {"instructions": "Hello Bob"}
+    assert replace_strings_in_nested_dict(agent, dict(sub_dict, name="Ann")) == {"instructions": "Hello Ann"}
@@ -0,0 +1,60 @@
+import json
+
+import pytest
+from pyhocon import ConfigFactory, HOCONConverter
+
+from documents import random_documents
+from hocon_core import iter_hocon, iter_json, iter_yaml, output_file_name, synthetic_workload, write_text
+
+
+def pyhocon_text(data):
+    try:
+        return HOCONConverter.to_hocon(ConfigFactory.from_dict(data))
+    except Exception as e:
+        return type(e)
+
+
+def written(writer, data, chunk_size):
+    try:
+        return ''.join(writer(data, chunk_size=chunk_size))
+    except Exception as e:
+        return type(e)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_hocon_matches_pyhocon(seed):
+    for data in random_documents(seed, 300):
+        expected = pyhocon_text(data)
+        for chunk_size in (1, 64, 65536):
+            assert written(iter_hocon, data, chunk_size) == expected, data
+
+
+def test_hocon_of_a_network_matches_pyhocon():
+    network = synthetic_workload(20)["network"]
+    assert write_text(network) == pyhocon_text(network)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_json_matches_json_dumps(seed):
+    for data in random_documents(seed, 300):
+        expected = json.dumps(data, indent=2, ensure_ascii=False)
+        assert written(iter_json, data, 1) == written(iter_json, data, 65536) == expected
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_yaml_loads_back(seed):
+    yaml = pytest.importorskip("yaml")
+    for data in random_documents(seed, 300):
+        text = written(iter_yaml, data, 1)
+        assert text == written(iter_yaml, data, 65536)
+        assert yaml.safe_load(text) == data, text
+
+
+def test_output_file_name():
+    assert output_file_name("network.conf", "hocon") == "network.conf"
+    assert output_file_name("network.HOCON", "hocon") == "network.HOCON"
+    assert output_file_name("network", "hocon") == "network.hocon"
+    assert output_file_name("network.json", "hocon") == "network.hocon"
+    assert output_file_name("network.conf", "json") == "network.json"
+    assert output_file_name("network.yml", "yaml") == "network.yml"
+    assert output_file_name("network.v2", "yaml") == "network.v2.yaml"